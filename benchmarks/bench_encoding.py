@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Encoding benchmark for pages that don't declare a charset: requests'
+``resp.text`` versus charset.decode_html() (BOM → header → <meta> in a
+bounded prefix → UTF-8 → prefix detection).
+
+Bodies are corpus pages with the charset stripped from both the header and
+the markup, concatenated to each target size. Two header cases:
+
+  text_html   "Content-Type: text/html" — requests assumes ISO-8859-1
+  no_type     no Content-Type — requests detects over the whole body
+
+For each, the best-of decode time and whether the text came out right (the
+corpus is UTF-8 and contains non-ASCII punctuation). scrape_page() times on
+the mock server's /undeclared/ pages versus declared ones follow.
+
+Usage:
+  python benchmarks/bench_encoding.py --sizes 50,500,2000 --repeat 5 -o encoding.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, ROOT)
+
+import corpus  # noqa: E402
+from mock_server import MockWebServer  # noqa: E402
+
+HEADER_CASES = {"text_html": "text/html", "no_type": None}
+
+
+def _best_of(fn, repeat: int) -> float:
+    """Best wall time of ``repeat`` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return round(best, 3)
+
+
+def _undeclared_body(size_kb: int) -> bytes:
+    """UTF-8 HTML of about ``size_kb`` KB with no <meta charset>."""
+    parts, total, n = [], 0, 0
+    while total < size_kb * 1024:
+        html = corpus.article(f"/article/{n}", n).replace("<meta charset='utf-8'>", "")
+        parts.append(html)
+        total += len(html.encode("utf-8"))
+        n += 1
+    return "".join(parts).encode("utf-8")
+
+
+def _requests_text(body: bytes, content_type: str | None) -> str:
+    """What resp.text returns for this body and header."""
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+
+    resp = Response()
+    resp._content = body
+    resp.headers = CaseInsensitiveDict({"Content-Type": content_type} if content_type else {})
+    resp.encoding = get_encoding_from_headers(resp.headers)  # as the HTTP adapter sets it
+    return resp.text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plethora undeclared-charset decoding benchmark")
+    parser.add_argument("--sizes", default="50,500,2000", help="Body sizes in KB, comma-separated")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-o", "--out", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    import scraper
+    from charset import decode_html
+
+    results: dict[str, dict] = {}
+    for size_kb in (int(s) for s in args.sizes.split(",")):
+        body = _undeclared_body(size_kb)
+        truth = body.decode("utf-8")
+        for case, content_type in HEADER_CASES.items():
+            results[f"{size_kb}kb_{case}"] = {
+                "requests_ms": _best_of(lambda: _requests_text(body, content_type), args.repeat),
+                "requests_correct": _requests_text(body, content_type) == truth,
+                "resolver_ms": _best_of(lambda: decode_html(body, content_type), args.repeat),
+                "resolver_correct": decode_html(body, content_type)[0] == truth,
+            }
+
+    scraper.SESSION.trust_env = False
+    scraper.DOMAIN_DELAY = 0.0
+    scraper.CACHE_DIR = tempfile.mkdtemp(prefix="plethora-bench-")
+    with MockWebServer() as server:
+        for kind in corpus.KINDS:
+            for prefix in ("", "/undeclared"):
+                url = f"{server.base_url}{prefix}/{kind}/1"
+                page = scraper.scrape_page(url, use_cache=False)
+                results[f"scrape_page{prefix.replace('/', '_')}_{kind}"] = {
+                    "ms": _best_of(lambda: scraper.scrape_page(url, use_cache=False), args.repeat),
+                    "correct": "—" in page.get("meta_description", ""),
+                }
+
+    report = {
+        "benchmark": "encoding",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"sizes_kb": args.sizes, "repeat": args.repeat},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
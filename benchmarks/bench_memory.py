@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for page records: retained size of a run's pages as plain
+dicts (scrape_page's shape) versus compact PageRecords (records.py).
+
+Pages are scraped from the mock server's corpus across every page kind, then
+each form is rebuilt from JSON under tracemalloc so both start from freshly
+allocated objects, the way pages arrive from scrape_page or the cache.
+
+Usage:
+  python benchmarks/bench_memory.py --pages 300 -o memory.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, ROOT)
+
+import corpus  # noqa: E402
+from mock_server import MockWebServer  # noqa: E402
+
+
+def _retained_bytes(build) -> int:
+    """Bytes still allocated after ``build()`` returns, with its result kept alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        kept = build()
+        gc.collect()
+        current, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plethora page-record memory benchmark")
+    parser.add_argument("--pages", type=int, default=300, help="Pages to scrape (split across kinds)")
+    parser.add_argument("-o", "--out", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    import scraper
+    from records import PageRecord
+
+    scraper.SESSION.trust_env = False
+    scraper.DOMAIN_DELAY = 0.0
+    scraper.CACHE_DIR = tempfile.mkdtemp(prefix="plethora-bench-")
+
+    with MockWebServer() as server:
+        blobs = []
+        for i in range(args.pages):
+            kind = corpus.KINDS[i % len(corpus.KINDS)]
+            page = scraper.scrape_page(f"{server.base_url}/{kind}/{i}", use_cache=False)
+            blobs.append(json.dumps(page, ensure_ascii=False))
+
+    dict_bytes = _retained_bytes(lambda: [json.loads(b) for b in blobs])
+    record_bytes = _retained_bytes(lambda: [PageRecord.from_dict(json.loads(b)) for b in blobs])
+
+    mb = 1024 * 1024
+    report = {
+        "benchmark": "memory",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"pages": args.pages},
+        "results": {
+            "dict_mb": round(dict_bytes / mb, 2),
+            "record_mb": round(record_bytes / mb, 2),
+            "reduction_pct": round(100 * (1 - record_bytes / dict_bytes), 1) if dict_bytes else None,
+        },
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
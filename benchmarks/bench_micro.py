@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the CPU-bound stages: clean_text, scrape_page parsing
+per corpus page kind, URL-cache hits per cache format, and format_report per
+output format.
+
+Pages are served by the mock server with zero latency, so scrape_page time
+is dominated by parsing/extraction rather than the network.
+
+Usage:
+  python benchmarks/bench_micro.py --repeat 5 -o micro.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, ROOT)
+
+import corpus  # noqa: E402
+from mock_server import MockWebServer  # noqa: E402
+
+
+def _best_of(fn, repeat: int) -> float:
+    """Best wall time of ``repeat`` calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - t0) * 1000)
+    return round(best, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plethora stage micro-benchmarks")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--level", default="high", choices=["low", "medium", "high"])
+    parser.add_argument("-o", "--out", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    import scraper
+    from formatter import format_report
+
+    scraper.SESSION.trust_env = False
+    scraper.DOMAIN_DELAY = 0.0
+    scraper.CACHE_DIR = tempfile.mkdtemp(prefix="plethora-bench-")
+
+    results: dict[str, float] = {}
+
+    raw_text = corpus.article("/article/0", 0)
+    results["clean_text_ms"] = _best_of(lambda: scraper.clean_text(raw_text), args.repeat)
+
+    pages = []
+    with MockWebServer() as server:
+        for kind in corpus.KINDS:
+            url = f"{server.base_url}/{kind}/1"
+            results[f"scrape_page_{kind}_ms"] = _best_of(
+                lambda: scraper.scrape_page(url, use_cache=False), args.repeat)
+            pages.append(scraper.scrape_page(url, use_cache=False))
+
+    # Cache hit as a medium txt report reads it: text, headings, meta, lists
+    def _medium_hit(url):
+        page = scraper._cache_get(url, None)
+        page["text"], page.get("headings"), page.get("meta_description"), page.get("lists")
+
+    for cache_format in ("json", "binary"):
+        scraper.CACHE_FORMAT = cache_format
+        for kind, page in zip(corpus.KINDS, pages):
+            scraper._cache_put(page["url"], page)
+            scraper.flush_cache()  # time reads from disk, not the write-behind queue
+            results[f"cache_hit_{cache_format}_{kind}_ms"] = _best_of(
+                lambda: _medium_hit(page["url"]), args.repeat)
+
+    data = {
+        "query": "plethora benchmark query", "level": args.level,
+        "search_results": [{"title": p["title"], "url": p["url"], "snippet": ""} for p in pages],
+        "pages": pages,
+        "subpages": {p["url"]: pages for p in pages} if args.level == "high" else {},
+    }
+    for fmt in ("txt", "md", "html", "json", "pdf"):
+        try:
+            results[f"format_{fmt}_ms"] = _best_of(lambda: format_report(data, fmt), args.repeat)
+        except ImportError:  # fpdf2 not installed
+            results[f"format_{fmt}_ms"] = None
+
+    report = {
+        "benchmark": "micro",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"repeat": args.repeat, "level": args.level},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+End-to-end pipeline benchmark — runs scraper.run() against the local mock
+server at every (level, workers) combination and reports JSON.
+
+Each configuration runs in its own subprocess so peak RSS and CPU time
+belong to that configuration alone. Per-run metrics:
+
+  pages_per_sec       pages scraped (results + sub-pages) / wall time
+  latency_p50_ms      scrape_page() latency percentiles
+  latency_p95_ms
+  cpu_s               user+sys CPU time of the run
+  peak_rss_mb         peak resident set size of the process
+
+With --shards N, pages and sub-pages are fetched through a distributed
+Coordinator by N in-process shard workers, each scraping with the
+configuration's worker count, instead of the local pool; with --deadline
+SECS, runs are deadline-bounded and report what the deadline cut and how
+many queue tasks were left behind.
+
+Usage:
+  python benchmarks/bench_pipeline.py --levels low,medium,high --workers 1,4,8
+  python benchmarks/bench_pipeline.py --out new.json --compare baseline.json
+  python benchmarks/bench_pipeline.py --levels high --shards 2 --deadline 1.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, ROOT)
+
+from mock_server import MockConfig, MockWebServer  # noqa: E402
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+# ── Child: one configuration ─────────────────────────────────────────────────
+
+def run_child(cfg: dict) -> dict:
+    import scraper
+
+    scraper.SESSION.trust_env = False  # never route localhost through a proxy
+    scraper.DOMAIN_DELAY = cfg["domain_delay"]
+    scraper.CACHE_DIR = cfg["cache_dir"]
+    scraper.SEARCH_CACHE_DIR = os.path.join(cfg["cache_dir"], "search")
+    scraper.JOURNAL_DIR = os.path.join(cfg["cache_dir"], "runs")  # deadline runs keep theirs
+
+    latencies: list[float] = []
+    errors = 0
+    real_scrape_page = scraper.scrape_page
+
+    def timed_scrape_page(url, *args, **kwargs):
+        nonlocal errors
+        t0 = time.perf_counter()
+        page = real_scrape_page(url, *args, **kwargs)
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if page.get("error"):
+            errors += 1
+        return page
+
+    scraper.scrape_page = timed_scrape_page
+    provider = scraper.DuckDuckGoProvider(base_url=cfg["ddg_url"])
+
+    coordinator = queue = None
+    if cfg["shards"]:
+        import threading
+        from distributed import Coordinator, MemoryQueue, run_worker
+
+        queue = MemoryQueue()
+        coordinator = Coordinator(queue, cfg["shards"])
+        for shard in range(cfg["shards"]):
+            threading.Thread(target=run_worker, args=(queue, shard, f"bench-{shard}"),
+                             kwargs={"workers": cfg["workers"], "log": lambda *a: None},
+                             daemon=True).start()
+
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    paths = scraper.run(
+        query=cfg["query"], level=cfg["level"], num_results=cfg["results"],
+        max_subpages=cfg["subpages"], output_dir=cfg["output_dir"],
+        workers=cfg["workers"], use_cache=cfg["use_cache"], quiet=True,
+        out_format=cfg["format"], search_provider=provider,
+        coordinator=coordinator, deadline=cfg["deadline"],
+    )
+    wall = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    peak_rss = _peak_rss_mb()
+    extra = {}
+    if coordinator is not None:
+        coordinator.close()  # must not raise, even for futures the deadline cancelled
+        extra["queue_tasks_left"] = len(queue._tasks)
+    if cfg["deadline"]:
+        json_path = next((p for p in paths if p.endswith(".json")), None)
+        if json_path:
+            with open(json_path, "r", encoding="utf-8") as f:
+                cut = json.load(f).get("deadline") or {}
+            extra["deadline_cut"] = {k: len(v) if isinstance(v, list) else v
+                                     for k, v in cut.items()}
+
+    return {
+        "level": cfg["level"],
+        "workers": cfg["workers"],
+        "results": cfg["results"],
+        "subpages": cfg["subpages"],
+        "format": cfg["format"],
+        "wall_s": round(wall, 4),
+        "cpu_s": round(cpu, 4),
+        "pages": len(latencies),
+        "errors": errors,
+        "pages_per_sec": round(len(latencies) / wall, 3) if wall and latencies else 0.0,
+        "latency_p50_ms": round(_percentile(latencies, 50), 2),
+        "latency_p95_ms": round(_percentile(latencies, 95), 2),
+        "peak_rss_mb": round(peak_rss, 2) if peak_rss is not None else None,
+        "report_bytes": sum(os.path.getsize(p) for p in paths),
+        **extra,
+    }
+
+
+# ── Parent: sweep configurations ─────────────────────────────────────────────
+
+def _run_config(cfg: dict) -> dict:
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", json.dumps(cfg)],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    if proc.returncode != 0:
+        return {"level": cfg["level"], "workers": cfg["workers"],
+                "error": proc.stderr.strip().splitlines()[-1:] or ["child failed"]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _compare(current: dict, baseline_path: str) -> None:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    base = {(r["level"], r["workers"]): r for r in baseline.get("runs", []) if "error" not in r}
+    print(f"\n{'level':<8}{'workers':>8}{'pages/s':>12}{'Δ':>9}{'p95 ms':>10}{'Δ':>9}{'RSS MB':>9}{'Δ':>9}",
+          file=sys.stderr)
+    for r in current["runs"]:
+        b = base.get((r["level"], r["workers"]))
+        if "error" in r or not b:
+            continue
+
+        def delta(key):
+            if not b.get(key) or r.get(key) is None:
+                return "n/a"
+            return f"{(r[key] - b[key]) / b[key] * 100:+.1f}%"
+
+        print(f"{r['level']:<8}{r['workers']:>8}{r['pages_per_sec']:>12}{delta('pages_per_sec'):>9}"
+              f"{r['latency_p95_ms']:>10}{delta('latency_p95_ms'):>9}"
+              f"{r['peak_rss_mb'] or 0:>9}{delta('peak_rss_mb'):>9}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plethora end-to-end pipeline benchmark")
+    parser.add_argument("--levels", default="low,medium,high")
+    parser.add_argument("--workers", default="1,4,8")
+    parser.add_argument("-n", "--results", type=int, default=20)
+    parser.add_argument("-s", "--subpages", type=int, default=2)
+    parser.add_argument("-f", "--format", default="txt",
+                        choices=["txt", "md", "html", "json", "pdf", "all"])
+    parser.add_argument("--query", default="plethora benchmark query")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Injected server latency")
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--error-rate", type=float, default=0.05,
+                        help="Fraction of corpus paths that fail (stable across runs)")
+    parser.add_argument("--error-status", type=int, default=404)
+    parser.add_argument("--domain-delay", type=float, default=0.0,
+                        help="scraper.DOMAIN_DELAY during the run (all pages share one host)")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="Enable the URL cache and pre-populate it with an untimed run")
+    parser.add_argument("--shards", type=int, default=0,
+                        help="Fetch through a Coordinator with this many in-process shard workers")
+    parser.add_argument("--deadline", type=float, help="Run deadline in seconds")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("-o", "--out", help="Write JSON results here (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON to print deltas against")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(json.loads(args.child))))
+        return
+
+    mock_cfg = MockConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status)
+    runs = []
+    with MockWebServer(config=mock_cfg) as server, tempfile.TemporaryDirectory() as tmp:
+        for level in args.levels.split(","):
+            for workers in (int(w) for w in args.workers.split(",")):
+                cfg = {
+                    "query": args.query, "level": level, "workers": workers,
+                    "results": args.results, "subpages": args.subpages,
+                    "format": args.format, "ddg_url": server.ddg_url,
+                    "domain_delay": args.domain_delay, "use_cache": args.warm_cache,
+                    "shards": args.shards, "deadline": args.deadline,
+                    "cache_dir": os.path.join(tmp, "cache"),
+                    "output_dir": os.path.join(tmp, "reports"),
+                }
+                if args.warm_cache:
+                    _run_config(cfg)
+                for i in range(args.repeat):
+                    result = _run_config(cfg)
+                    result["repeat"] = i
+                    runs.append(result)
+                    print(f"[bench] {level:<6} workers={workers:<3} "
+                          f"{result.get('pages_per_sec', 'ERR')} pages/s", file=sys.stderr)
+
+    report = {
+        "benchmark": "pipeline",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("child", "out", "compare")},
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.compare:
+        _compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
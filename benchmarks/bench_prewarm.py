@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Connection-setup benchmark: a --level medium run over results spread across
+many hosts, with and without the DNS cache and first-page pre-warming.
+
+The mock server puts each result on one of --hosts host names
+(siteN.test), charges --connect-ms per new connection (TCP + TLS stand-in)
+and --latency-ms per request. Name lookups for those hosts are answered
+in-process after --dns-ms, and counted. Configurations:
+
+  cold        DNS_TTL = 0, PREWARM off — every connection resolves its host
+  dns_cache   DNS_TTL on,  PREWARM off
+  prewarm     DNS_TTL on,  PREWARM on  — first-page hosts resolved, robots.txt
+              fetched and connected to while the other search pages load
+
+For each, the median over --repeat runs of: run() wall time, the time a
+page spends on the network inside scrape_page() (robots.txt check + time to
+headers + download, so DNS, connect and TLS included; mean and p95), the
+number of real DNS lookups, and the pages scraped. On a small machine the
+wall time is dominated by HTML parsing; page_fetch_ms isolates what
+pre-warming takes off the critical path. Connection pools, the DNS
+cache and robots.txt cache are reset between runs.
+
+Usage:
+  python benchmarks/bench_prewarm.py --results 40 --hosts 20 --repeat 3 -o prewarm.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, HERE)
+sys.path.insert(0, ROOT)
+
+from mock_server import MockConfig, MockWebServer  # noqa: E402
+from profiling import Profiler  # noqa: E402
+
+CONFIGS = {
+    "cold": {"DNS_TTL": 0, "PREWARM": False},
+    "dns_cache": {"DNS_TTL": 300, "PREWARM": False},
+    "prewarm": {"DNS_TTL": 300, "PREWARM": True},
+}
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _fake_dns(dns_ms: float, lookups: list):
+    """getaddrinfo that answers *.test with loopback after ``dns_ms``."""
+    real = socket.getaddrinfo
+
+    def getaddrinfo(host, port, *args, **kwargs):
+        if isinstance(host, str) and host.endswith(".test"):
+            lookups.append(host)
+            time.sleep(dns_ms / 1000)
+            host = "127.0.0.1"
+        return real(host, port, *args, **kwargs)
+
+    return getaddrinfo
+
+
+def _reset(scraper) -> None:
+    scraper._dns_cache.clear()
+    scraper._robots_cache.clear()
+    scraper._session().close()  # drops pooled connections; pools are recreated on use
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plethora DNS cache / pre-warming benchmark")
+    parser.add_argument("--results", type=int, default=40)
+    parser.add_argument("--hosts", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--connect-ms", type=float, default=60.0)
+    parser.add_argument("--dns-ms", type=float, default=30.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--out", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    import scraper
+
+    lookups: list[str] = []
+    socket.getaddrinfo = _fake_dns(args.dns_ms, lookups)
+    scraper.SESSION.trust_env = False
+    scraper.DOMAIN_DELAY = 0.0
+    scraper.INDEX_ENABLED = False
+
+    mock_cfg = MockConfig(latency_ms=args.latency_ms, connect_ms=args.connect_ms,
+                          hosts=args.hosts)
+    results: dict[str, dict] = {}
+    with MockWebServer(config=mock_cfg) as server:
+        provider = scraper.DuckDuckGoProvider(server.ddg_url)
+        for name, settings in CONFIGS.items():
+            for attr, value in settings.items():
+                setattr(scraper, attr, value)
+            walls, fetch_mean, fetch_p95, dns, pages = [], [], [], [], 0
+            for _ in range(args.repeat):
+                _reset(scraper)
+                del lookups[:]
+                out = tempfile.mkdtemp(prefix="plethora-bench-")
+                prof = Profiler()
+                t0 = time.perf_counter()
+                paths = scraper.run("bench query", level="medium", num_results=args.results,
+                                    output_dir=out, workers=args.workers, use_cache=False,
+                                    quiet=True, out_format="json", search_provider=provider,
+                                    journal=False, profiler=prof)
+                walls.append(time.perf_counter() - t0)
+                fetch = [t.get("robots", 0) + t.get("ttfb", 0) + t.get("download", 0)
+                         for t in prof.url_timings().values() if "ttfb" in t]
+                fetch_mean.append(statistics.mean(fetch))
+                fetch_p95.append(_percentile(fetch, 95))
+                dns.append(len(lookups))
+                with open(paths[0], encoding="utf-8") as f:
+                    pages = sum(1 for p in json.load(f)["pages"] if not p.get("error"))
+            results[name] = {
+                "wall_s": round(statistics.median(walls), 3),
+                "page_fetch_ms_mean": round(statistics.median(fetch_mean), 1),
+                "page_fetch_ms_p95": round(statistics.median(fetch_p95), 1),
+                "dns_lookups": statistics.median(dns),
+                "pages_ok": pages,
+            }
+
+    report = {
+        "benchmark": "prewarm",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: getattr(args, k) for k in
+                   ("results", "hosts", "workers", "latency_ms", "connect_ms", "dns_ms", "repeat")},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark and import-time budget check.
+
+Short cron runs pay interpreter start-up plus module imports on every call,
+so scraper.py keeps requests, bs4, concurrent.futures and friends out of
+module level. This script guards that:
+
+  * cumulative import time (``python -X importtime``) of ``scrape`` and
+    ``scraper``, best of --repeat fresh interpreters, against --budget-ms
+  * wall time of ``scrape.py --help``
+  * which heavy modules each path actually loads — none for a bare import,
+    and no bs4 for a whole --level low run against the mock server
+
+Exits non-zero when a budget or a lazy-import check fails, so it can gate CI.
+
+Usage:
+  python benchmarks/bench_startup.py --repeat 7 --budget-ms 60 -o startup.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# Must not be loaded by a plain `import scraper` / `import scrape`
+HEAVY_MODULES = ("requests", "urllib3", "bs4", "concurrent.futures", "http.server", "rich")
+
+_LOW_RUN = """
+import sys, tempfile
+sys.path[:0] = [{here!r}, {root!r}]
+from mock_server import MockWebServer
+import scraper
+scraper.SESSION.trust_env = False
+scraper.CACHE_DIR = tempfile.mkdtemp(prefix="plethora-bench-")
+scraper.SEARCH_CACHE_DIR = scraper.CACHE_DIR
+with MockWebServer() as server:
+    scraper.run("startup check", level="low", num_results=20, quiet=True, journal=False,
+                output_dir=tempfile.mkdtemp(prefix="plethora-bench-"),
+                search_provider=scraper.DuckDuckGoProvider(server.ddg_url))
+print(" ".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # measure imports, not compiling
+    env["PYTHONPATH"] = ROOT
+    return env
+
+
+def _python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=_env(),
+                          capture_output=True, text=True, check=True)
+
+
+def _import_ms(module: str) -> float:
+    """Cumulative import time of ``module`` in a fresh interpreter, in ms."""
+    err = _python("-X", "importtime", "-c", f"import {module}").stderr
+    for line in reversed(err.splitlines()):
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"no importtime line for {module}")
+
+
+def _loaded_heavy(code: str) -> list[str]:
+    out = _python("-c", code).stdout.split()
+    return [m for m in out if m]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plethora cold-start benchmark")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=60.0,
+                        help="Max cumulative import time of `import scrape` / `import scraper`")
+    parser.add_argument("-o", "--out", help="Write JSON results here (default: stdout)")
+    args = parser.parse_args()
+
+    _python("-c", "import scrape, scraper, formatter")  # warm __pycache__
+
+    results: dict[str, object] = {}
+    for module in ("scrape", "scraper"):
+        results[f"import_{module}_ms"] = round(
+            min(_import_ms(module) for _ in range(args.repeat)), 2)
+
+    best = float("inf")
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        _python(os.path.join(ROOT, "scrape.py"), "--help")
+        best = min(best, time.perf_counter() - t0)
+    results["help_wall_ms"] = round(best * 1000, 2)
+
+    check = "import sys, {m}; print(' '.join(h for h in {heavy!r} if h in sys.modules))"
+    loaded = {
+        "import_scrape": _loaded_heavy(check.format(m="scrape", heavy=HEAVY_MODULES)),
+        "import_scraper": _loaded_heavy(check.format(m="scraper", heavy=HEAVY_MODULES)),
+        "level_low_run": _loaded_heavy(_LOW_RUN.format(here=HERE, root=ROOT, heavy=("bs4",))),
+    }
+    results["heavy_modules_loaded"] = loaded
+
+    failures = [f"{k} took {v} ms (budget {args.budget_ms} ms)"
+                for k, v in results.items()
+                if k.startswith("import_") and v > args.budget_ms]
+    failures += [f"{k} loaded {', '.join(v)}" for k, v in loaded.items() if v]
+
+    report = {
+        "benchmark": "startup",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"repeat": args.repeat, "budget_ms": args.budget_ms},
+        "results": results,
+        "failures": failures,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if failures:
+        for f in failures:
+            print(f"✗ {f}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Synthetic page corpus for the benchmark server.
+
+Every page is generated deterministically from its path, so two benchmark
+runs against the same corpus see byte-identical HTML. These page shapes
+cover the hot paths in scrape_page / clean_text / the formatters:
+
+  article — Wikipedia-sized article: headings, long paragraphs with
+            [12]-style citation markers, lists, an infobox, images
+  index   — link-heavy index page (hundreds of same-domain links)
+  table   — a page dominated by one huge table
+  mirror  — a syndicated copy of an article (same body, different
+            title and chrome) for near-duplicate detection
+"""
+
+import random
+from html import escape
+from urllib.parse import quote
+
+KINDS = ("article", "index", "table")
+
+_WORDS = (
+    "data system network model python search engine result page content "
+    "analysis research method value process function language library "
+    "structure performance memory cache thread request response server "
+    "client protocol document history science theory example section "
+    "table figure algorithm parser text index query report level detail"
+).split()
+
+
+def _rng(path: str) -> random.Random:
+    return random.Random(path)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    s = " ".join(rng.choice(_WORDS) for _ in range(words))
+    return s[0].upper() + s[1:] + "."
+
+
+def _paragraph(rng: random.Random, sentences: int) -> str:
+    parts = []
+    for _ in range(sentences):
+        parts.append(_sentence(rng, rng.randint(8, 24)))
+        if rng.random() < 0.3:
+            parts.append(f"[{rng.randint(1, 200)}]")
+    return " ".join(parts)
+
+
+def _page(title: str, body: str) -> str:
+    return (
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        f"<title>{escape(title)}</title>"
+        f"<meta name='description' content='{escape(title)} — benchmark corpus page'>"
+        "<script>var tracking = {id: 1};</script><style>body{font-family:serif}</style>"
+        "</head><body>"
+        "<header><nav><a href='/'>Home</a> <a href='/login'>Log in</a></nav></header>"
+        f"{body}"
+        "<footer><p>Footer text that should be stripped by the scraper.</p></footer>"
+        "</body></html>"
+    )
+
+
+def article(path: str, n: int) -> str:
+    rng = _rng(path)
+    title = f"Article {n}: {_sentence(rng, 4)[:-1]}"
+    body = [f"<main><div class='mw-parser-output'><h1>{escape(title)}</h1>"]
+    body.append("<table class='infobox'>" + "".join(
+        f"<tr><th>Key {i}</th><td>{_sentence(rng, 3)}</td></tr>" for i in range(12)) + "</table>")
+    for s in range(12):
+        body.append(f"<h2>Section {s} <span>[edit]</span></h2>")
+        for _ in range(rng.randint(3, 6)):
+            body.append(f"<p>{_paragraph(rng, rng.randint(4, 9))}</p>")
+        if s % 3 == 0:
+            body.append(f"<h3>Subsection {s}.1</h3><ul>" + "".join(
+                f"<li>{_sentence(rng, 6)}</li>" for _ in range(8)) + "</ul>")
+        if s % 4 == 0:
+            body.append(f"<img src='/img/{n}-{s}.png' alt='Figure {s}: {_sentence(rng, 5)}'>")
+        body.append(" ".join(
+            f"<a href='/article/{rng.randint(0, 999)}'>{rng.choice(_WORDS)} link</a>"
+            for _ in range(6)))
+    body.append("</div></main>")
+    return _page(title, "".join(body))
+
+
+def index(path: str, n: int) -> str:
+    rng = _rng(path)
+    title = f"Index {n}"
+    links = []
+    for i in range(600):
+        kind = KINDS[i % len(KINDS)]
+        links.append(f"<li><a href='/{kind}/{rng.randint(0, 999)}'>{_sentence(rng, 4)}</a></li>")
+    body = f"<main><h1>{title}</h1><p>{_paragraph(rng, 3)}</p><ul>{''.join(links)}</ul></main>"
+    return _page(title, body)
+
+
+def table(path: str, n: int) -> str:
+    rng = _rng(path)
+    title = f"Table {n}"
+    rows = ["<tr>" + "".join(f"<th>Column {c}</th>" for c in range(8)) + "</tr>"]
+    for r in range(2000):
+        rows.append("<tr>" + "".join(
+            f"<td>{rng.choice(_WORDS)} {rng.randint(0, 10**6)}</td>" for _ in range(8)) + "</tr>")
+    body = (f"<article><h1>{title}</h1><p>{_paragraph(rng, 4)}</p>"
+            f"<table>{''.join(rows)}</table></article>")
+    return _page(title, body)
+
+
+def mirror(path: str, n: int) -> str:
+    html = article(f"/article/{n}", n)
+    return html.replace("<title>", "<title>Mirror — ", 1).replace(
+        "<header>", "<header><p>Syndicated from the original source.</p>", 1)
+
+
+def serp(base: str, query: str, offset: int, page_size: int = 20,
+         hosts: list[str] | None = None) -> str:
+    """A DuckDuckGo-HTML-shaped results page pointing into the corpus at ``base``
+    (or, round-robin, at each of ``hosts``)."""
+    rng = _rng(f"serp:{query}:{offset}")
+    results = []
+    for i in range(offset, offset + page_size):
+        if hosts:
+            base = hosts[i % len(hosts)]
+        kind = KINDS[i % len(KINDS)]
+        target = f"{base}/{kind}/{i}"
+        if i % 7 == 6:  # every 7th result is a mirror of an earlier article
+            kind = "mirror"
+            target = f"{base}/mirror/{(i // 3) * 3 - 3}"
+        href = f"//duckduckgo.com/l/?uddg={quote(target, safe='')}&rut=bench"
+        results.append(
+            "<div class='result results_links web-result'>"
+            f"<h2 class='result__title'><a class='result__a' href='{escape(href)}'>"
+            f"{kind.title()} {i} — {escape(query)}</a></h2>"
+            f"<a class='result__snippet' href='{escape(href)}'>{_sentence(rng, 18)}</a>"
+            "</div>"
+        )
+    return f"<html><body><div class='results'>{''.join(results)}</div></body></html>"
+
+
+RENDERERS = {"article": article, "index": index, "table": table, "mirror": mirror}
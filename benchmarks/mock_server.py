@@ -0,0 +1,182 @@
+"""
+Local HTTP server that stands in for DuckDuckGo and the result sites.
+
+  /html/?q=...&s=N        fake DDG results page (20 results from offset N)
+  /article/N, /index/N,
+  /table/N                corpus pages (see corpus.py)
+  /redirect/<kind>/N      301 to /<kind>/N (redirect-chain handling)
+  /undeclared/<kind>/N    /<kind>/N with no charset anywhere: bare
+                          "Content-Type: text/html" and no <meta charset>
+  /robots.txt             allows everything except /private/
+
+With MockConfig(hosts=N) result links are spread over N host names,
+site0.test … site<N-1>.test on the same port; whoever uses them must resolve
+those names to the server (see bench_prewarm.py). connect_ms is paid once
+per connection, before its first response, standing in for a TCP + TLS
+handshake.
+
+Latency and errors are injected per request. Jitter and which paths fail
+are derived from a hash of the path, not a global RNG, so the same paths
+are slow or fail on every run and results stay comparable.
+
+Run standalone:  python benchmarks/mock_server.py --port 8765 --latency-ms 50
+"""
+
+import argparse
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+try:
+    from . import corpus
+except ImportError:  # run as a script
+    import corpus
+
+ROBOTS_TXT = "User-agent: *\nDisallow: /private/\n"
+
+
+class MockConfig:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 404,
+                 connect_ms: float = 0.0, hosts: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.connect_ms = connect_ms
+        self.hosts = hosts
+
+
+def _path_fraction(path: str) -> float:
+    """Stable value in [0, 1) derived from the path."""
+    return int(hashlib.sha256(path.encode()).hexdigest()[:8], 16) / 0x100000000
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "PlethoraBench/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):  # keep benchmark output clean
+        pass
+
+    def setup(self):
+        super().setup()
+        if self.server.config.connect_ms:
+            time.sleep(self.server.config.connect_ms / 1000)
+
+    def _send(self, status: int, body: str, content_type: str | None = "text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        cfg: MockConfig = self.server.config
+        parsed = urlparse(self.path)
+        path = parsed.path
+
+        if cfg.latency_ms or cfg.jitter_ms:
+            jitter = (2 * _path_fraction("jitter:" + self.path) - 1) * cfg.jitter_ms
+            time.sleep(max(cfg.latency_ms + jitter, 0.0) / 1000)
+
+        if path == "/robots.txt":
+            return self._send(200, ROBOTS_TXT, "text/plain; charset=utf-8")
+
+        if path == "/html/":
+            qs = parse_qs(parsed.query)
+            query = qs.get("q", [""])[0]
+            offset = int(qs.get("s", ["0"])[0] or 0)
+            hosts = None
+            if cfg.hosts:
+                port = self.server.server_address[1]
+                hosts = [f"http://site{k}.test:{port}" for k in range(cfg.hosts)]
+            return self._send(200, corpus.serp(self.server.base_url, query, offset, hosts=hosts))
+
+        if path.startswith("/redirect/"):
+            self.send_response(301)
+            self.send_header("Location", path[len("/redirect"):])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        parts = path.strip("/").split("/")
+        undeclared = len(parts) == 3 and parts[0] == "undeclared"
+        if undeclared:
+            parts = parts[1:]
+            path = "/" + "/".join(parts)
+        if len(parts) == 2 and parts[0] in corpus.RENDERERS and parts[1].isdigit():
+            if cfg.error_rate and _path_fraction(path) < cfg.error_rate:
+                return self._send(cfg.error_status, "<html><body>injected error</body></html>")
+            body = self.server.page_cache.get(path)
+            if body is None:
+                body = corpus.RENDERERS[parts[0]](path, int(parts[1]))
+                self.server.page_cache[path] = body
+            if undeclared:
+                return self._send(200, body.replace("<meta charset='utf-8'>", ""), "text/html")
+            return self._send(200, body)
+
+        self._send(404, "<html><body>not found</body></html>")
+
+
+class MockWebServer:
+    """Threaded mock server; usable as a context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, config: MockConfig | None = None):
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.config = config or MockConfig()
+        self.httpd.page_cache = {}
+        self.httpd.base_url = f"http://{host}:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return self.httpd.base_url
+
+    @property
+    def ddg_url(self) -> str:
+        return f"{self.base_url}/html/"
+
+    def start(self) -> "MockWebServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plethora benchmark mock web server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=404)
+    args = parser.parse_args()
+
+    cfg = MockConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status)
+    server = MockWebServer(args.host, args.port, cfg)
+    print(f"Serving on {server.base_url}  (DDG endpoint: {server.ddg_url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Character-encoding resolution for fetched HTML.
+
+``resp.text`` decodes with the Content-Type charset; when the header has none,
+requests either assumes ISO-8859-1 (text/*, ignoring <meta charset>) or runs
+charset detection over the whole body (and BeautifulSoup would detect again
+if handed bytes). Pages are instead decoded once, from raw bytes, the way
+browsers choose an encoding — looking only at a bounded prefix:
+
+  1. byte-order mark
+  2. charset parameter of the Content-Type header
+  3. <meta charset> / <meta http-equiv="Content-Type"> in the first PREFIX_BYTES
+  4. UTF-8, if the body decodes as UTF-8
+  5. detection over the first DETECT_BYTES (charset_normalizer, when installed),
+     falling back to windows-1252
+
+ISO-8859-1 and ASCII labels are read as windows-1252, their superset, as
+browsers do; a <meta> declaring UTF-16/32 means UTF-8 (the tag was readable
+as ASCII, so the page can't be UTF-16).
+"""
+
+import codecs
+import re
+
+PREFIX_BYTES = 4096    # where <meta charset> is looked for
+DETECT_BYTES = 16384   # what charset detection may look at
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),  # before UTF-16 LE, whose BOM is its prefix
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?\s*([^\s;\"']+)", re.IGNORECASE)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+?charset\s*=\s*[\"']?\s*([A-Za-z0-9._:-]+)", re.IGNORECASE)
+_AS_WINDOWS_1252 = {"iso8859-1", "ascii"}
+
+
+def _codec(label) -> str | None:
+    """Python codec name for a charset label, or None if unknown."""
+    if isinstance(label, bytes):
+        label = label.decode("ascii", "ignore")
+    try:
+        name = codecs.lookup(label.strip().strip("'\"")).name
+    except LookupError:
+        return None
+    return "cp1252" if name in _AS_WINDOWS_1252 else name
+
+
+def resolve_encoding(body: bytes, content_type: str | None = None) -> tuple[str | None, str]:
+    """(codec, source) from the BOM, the Content-Type header or a <meta> tag;
+    (None, "undeclared") if none of them names a known encoding."""
+    for bom, codec in _BOMS:
+        if body.startswith(bom):
+            return codec, "bom"
+    if content_type:
+        m = _HEADER_CHARSET_RE.search(content_type)
+        codec = _codec(m.group(1)) if m else None
+        if codec:
+            return codec, "header"
+    m = _META_CHARSET_RE.search(body, 0, PREFIX_BYTES)
+    codec = _codec(m.group(1)) if m else None
+    if codec:
+        if codec.startswith(("utf-16", "utf-32")):
+            codec = "utf-8"
+        return codec, "meta"
+    return None, "undeclared"
+
+
+def _detect(prefix: bytes) -> str:
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return "cp1252"
+    best = from_bytes(prefix).best()
+    return (best and _codec(best.encoding)) or "cp1252"
+
+
+def decode_html(body: bytes, content_type: str | None = None) -> tuple[str, str]:
+    """(text, codec) for an HTML response body. Undecodable bytes become
+    U+FFFD rather than failing the page."""
+    codec, _source = resolve_encoding(body, content_type)
+    if codec is None:
+        try:
+            return body.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            codec = _detect(body[:DETECT_BYTES])
+    return body.decode(codec, errors="replace"), codec
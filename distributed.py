@@ -0,0 +1,636 @@
+"""
+Distributed crawl: scrape work sharded by host across worker processes/nodes.
+
+The coordinator is a normal run() given a Coordinator: it still searches,
+journals, collapses near-duplicates and renders the reports, but fetching
+result pages and expanding sub-pages is handed out as tasks. Every task goes
+to shard ``hash(host) % num_shards`` and each worker owns exactly one shard,
+so all requests to a host — and its per-domain rate limit — live in a single
+worker. Sub-pages are same-host links, so they land on the parent's shard.
+
+Queue backends share one interface; open_queue() picks one from a spec:
+
+  sqlite:///path/queue.db   a SQLite file shared by coordinator and workers
+                            (one machine, or a filesystem with working locks)
+  tcp://host:port           the coordinator serves an in-memory queue there and
+                            workers connect to it (newline-delimited JSON)
+
+The TCP queue is plain text. Every request carries the shared token from
+PLETHORA_QUEUE_TOKEN and requests without it are refused; the coordinator
+will not serve on a non-loopback address unless a token is set. Anyone with
+the token can read pages and hand in results, so serve on a trusted network
+or through a tunnel.
+
+Workers hold a lease on their shard (renewed on every poll and on a timer
+while all their threads are busy) and on each task they claim, and scrape up
+to ``workers`` claimed tasks at a time. A second worker for a live shard is
+refused; if a worker dies, a replacement for its shard re-runs its
+unfinished tasks once the leases expire.
+"""
+
+import hashlib
+import hmac
+import ipaddress
+import itertools
+import os
+import secrets
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlparse
+
+import serialization
+
+LEASE_SECONDS = 300.0   # task / shard ownership without a sign of life
+POLL_INTERVAL = 0.2     # seconds between queue polls when idle
+LEASE_RENEW = LEASE_SECONDS / 3  # seconds between shard lease renewals in a busy worker
+TOKEN_ENV = "PLETHORA_QUEUE_TOKEN"  # shared secret for the TCP queue
+
+
+def shard_for(url: str, num_shards: int) -> int:
+    """Shard that owns ``url``'s host."""
+    host = (urlparse(url).hostname or "").lower()
+    digest = hashlib.blake2b(host.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % num_shards
+
+
+# ── Queue backends ───────────────────────────────────────────────────────────
+
+class MemoryQueue:
+    """In-process queue; what the TCP coordinator serves."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: dict[str, dict] = {}      # id → {shard, payload, worker, lease_until}
+        self._results: dict[str, dict] = {}
+        self._owners: dict[int, tuple[str, float]] = {}
+
+    def put(self, task_id: str, shard: int, payload: dict) -> None:
+        with self._lock:
+            self._tasks[task_id] = {"shard": shard, "payload": payload,
+                                    "worker": None, "lease_until": 0.0}
+
+    def acquire_shard(self, shard: int, worker: str, lease: float = LEASE_SECONDS) -> str:
+        """Take or renew ownership of ``shard``; returns the current owner."""
+        now = time.time()
+        with self._lock:
+            owner, until = self._owners.get(shard, (None, 0.0))
+            if owner in (None, worker) or until < now:
+                self._owners[shard] = (worker, now + lease)
+                return worker
+            return owner
+
+    def claim(self, shard: int, worker: str, lease: float = LEASE_SECONDS):
+        """(task_id, payload) of the next task on ``shard``, or None."""
+        if self.acquire_shard(shard, worker, lease) != worker:
+            return None
+        now = time.time()
+        with self._lock:
+            for task_id, task in self._tasks.items():
+                if task["shard"] == shard and (task["worker"] is None or task["lease_until"] < now):
+                    task["worker"], task["lease_until"] = worker, now + lease
+                    return task_id, task["payload"]
+        return None
+
+    def complete(self, task_id: str, result: dict) -> None:
+        with self._lock:
+            if self._tasks.pop(task_id, None) is not None:
+                self._results[task_id] = result
+
+    def take_results(self, task_ids: list[str]) -> dict[str, dict]:
+        with self._lock:
+            return {t: self._results.pop(t) for t in task_ids if t in self._results}
+
+    def claimed(self, task_ids: list[str]) -> list[str]:
+        """Those of ``task_ids`` a worker is working on (claimed, lease live)."""
+        now = time.time()
+        with self._lock:
+            return [t for t in task_ids if (task := self._tasks.get(t)) is not None
+                    and task["worker"] is not None and task["lease_until"] >= now]
+
+    def cancel(self, task_ids: list[str]) -> None:
+        """Drop tasks nobody will wait for; a result still arriving is discarded."""
+        with self._lock:
+            for task_id in task_ids:
+                self._tasks.pop(task_id, None)
+                self._results.pop(task_id, None)
+
+    def close(self) -> None:
+        pass
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id          TEXT PRIMARY KEY,
+    shard       INTEGER NOT NULL,
+    payload     BLOB NOT NULL,
+    worker      TEXT,
+    lease_until REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS tasks_by_shard ON tasks (shard, lease_until);
+CREATE TABLE IF NOT EXISTS results (
+    id     TEXT PRIMARY KEY,
+    result BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shard_owners (
+    shard  INTEGER PRIMARY KEY,
+    worker TEXT NOT NULL,
+    until  REAL NOT NULL
+);
+"""
+
+
+class SQLiteQueue:
+    """Queue in a SQLite file; every process opens the same path."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SQLITE_SCHEMA)
+
+    def _write(self, fn):
+        """Run ``fn(conn)`` in one write transaction (BEGIN IMMEDIATE takes the
+        write lock up front, so claims from several processes never race)."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    def put(self, task_id: str, shard: int, payload: dict) -> None:
+        self._write(lambda c: c.execute(
+            "INSERT OR REPLACE INTO tasks (id, shard, payload) VALUES (?, ?, ?)",
+            (task_id, shard, serialization.dumps(payload))))
+
+    @staticmethod
+    def _acquire(conn, shard: int, worker: str, lease: float) -> str:
+        now = time.time()
+        row = conn.execute("SELECT worker, until FROM shard_owners WHERE shard = ?",
+                           (shard,)).fetchone()
+        if row is None or row[0] == worker or row[1] < now:
+            conn.execute("INSERT OR REPLACE INTO shard_owners (shard, worker, until) "
+                         "VALUES (?, ?, ?)", (shard, worker, now + lease))
+            return worker
+        return row[0]
+
+    def acquire_shard(self, shard: int, worker: str, lease: float = LEASE_SECONDS) -> str:
+        return self._write(lambda c: self._acquire(c, shard, worker, lease))
+
+    def claim(self, shard: int, worker: str, lease: float = LEASE_SECONDS):
+        def _claim(conn):
+            if self._acquire(conn, shard, worker, lease) != worker:
+                return None
+            now = time.time()
+            row = conn.execute(
+                "SELECT id, payload FROM tasks WHERE shard = ? AND (worker IS NULL OR lease_until < ?) "
+                "ORDER BY rowid LIMIT 1", (shard, now)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE tasks SET worker = ?, lease_until = ? WHERE id = ?",
+                         (worker, now + lease, row[0]))
+            return row[0], serialization.loads(row[1])
+        return self._write(_claim)
+
+    def complete(self, task_id: str, result: dict) -> None:
+        def _complete(conn):
+            if conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount:
+                conn.execute("INSERT OR REPLACE INTO results (id, result) VALUES (?, ?)",
+                             (task_id, serialization.dumps(result)))
+        self._write(_complete)
+
+    def take_results(self, task_ids: list[str]) -> dict[str, dict]:
+        def _take(conn):
+            found = {}
+            for i in range(0, len(task_ids), 500):  # stay under SQLite's parameter limit
+                chunk = task_ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for task_id, blob in conn.execute(
+                        f"SELECT id, result FROM results WHERE id IN ({marks})", chunk):
+                    found[task_id] = serialization.loads(blob)
+                conn.execute(f"DELETE FROM results WHERE id IN ({marks})", chunk)
+            return found
+        return self._write(_take) if task_ids else {}
+
+    def claimed(self, task_ids: list[str]) -> list[str]:
+        now = time.time()
+        found = []
+        with self._lock:
+            for i in range(0, len(task_ids), 500):
+                chunk = task_ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                found.extend(row[0] for row in self._conn.execute(
+                    f"SELECT id FROM tasks WHERE id IN ({marks}) "
+                    "AND worker IS NOT NULL AND lease_until >= ?", (*chunk, now)))
+        return found
+
+    def cancel(self, task_ids: list[str]) -> None:
+        def _cancel(conn):
+            for i in range(0, len(task_ids), 500):
+                chunk = task_ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                conn.execute(f"DELETE FROM tasks WHERE id IN ({marks})", chunk)
+                conn.execute(f"DELETE FROM results WHERE id IN ({marks})", chunk)
+        if task_ids:
+            self._write(_cancel)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_QUEUE_OPS = {"put", "acquire_shard", "claim", "complete", "take_results", "claimed", "cancel"}
+
+
+class _QueueRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        queue = self.server.queue
+        token = self.server.token.encode("utf-8")
+        for line in self.rfile:
+            try:
+                req = serialization.loads(line)
+            except ValueError:
+                req = None
+            if not isinstance(req, dict) or not hmac.compare_digest(
+                    str(req.get("token") or "").encode("utf-8"), token):
+                self.wfile.write(serialization.dumps({"error": "unauthorized: wrong or missing "
+                                                      f"queue token (set {TOKEN_ENV})"}) + b"\n")
+                return  # drop the connection
+            try:
+                if req.get("op") not in _QUEUE_OPS:
+                    raise ValueError(f"unknown op {req.get('op')!r}")
+                reply = {"ok": getattr(queue, req["op"])(*req.get("args", ()))}
+            except Exception as e:
+                reply = {"error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(serialization.dumps(reply) + b"\n")
+
+
+class _QueueServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _ServedQueue(MemoryQueue):
+    """MemoryQueue that is also served over TCP for remote workers."""
+
+    def __init__(self, host: str, port: int, token: str = ""):
+        if not token and not _is_loopback(host):
+            raise ValueError(f"Serving the TCP queue on {host} lets anyone who can reach it "
+                             f"read pages and hand in results; set {TOKEN_ENV} on the "
+                             "coordinator and every worker, or serve on 127.0.0.1")
+        super().__init__()
+        self._server = _QueueServer((host, port), _QueueRequestHandler)
+        self._server.queue = self
+        self._server.token = token
+        self.address = self._server.server_address
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class TCPQueue:
+    """Worker-side client for a coordinator's TCP queue."""
+
+    def __init__(self, host: str, port: int, timeout: float = 30.0, token: str = ""):
+        self.address = (host, port)
+        self.timeout = timeout
+        self.token = token
+        self._lock = threading.Lock()
+        self._sock = None
+        self._file = None
+
+    def _connect(self):
+        self._sock = socket.create_connection(self.address, timeout=self.timeout)
+        self._file = self._sock.makefile("rb")
+
+    def _call(self, op: str, *args):
+        request = serialization.dumps({"op": op, "args": list(args), "token": self.token}) + b"\n"
+        with self._lock:
+            for attempt in (1, 2):  # reconnect once if the coordinator dropped us
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    self._sock.sendall(request)
+                    line = self._file.readline()
+                    if not line:
+                        raise ConnectionError("coordinator closed the connection")
+                    break
+                except OSError:
+                    self._disconnect()
+                    if attempt == 2:
+                        raise
+        reply = serialization.loads(line)
+        if "error" in reply:
+            raise RuntimeError(f"queue {op} failed: {reply['error']}")
+        return reply["ok"]
+
+    def _disconnect(self):
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._file = None
+
+    def put(self, task_id: str, shard: int, payload: dict) -> None:
+        self._call("put", task_id, shard, payload)
+
+    def acquire_shard(self, shard: int, worker: str, lease: float = LEASE_SECONDS) -> str:
+        return self._call("acquire_shard", shard, worker, lease)
+
+    def claim(self, shard: int, worker: str, lease: float = LEASE_SECONDS):
+        task = self._call("claim", shard, worker, lease)
+        return tuple(task) if task else None
+
+    def complete(self, task_id: str, result: dict) -> None:
+        self._call("complete", task_id, result)
+
+    def take_results(self, task_ids: list[str]) -> dict[str, dict]:
+        return self._call("take_results", task_ids)
+
+    def claimed(self, task_ids: list[str]) -> list[str]:
+        return self._call("claimed", task_ids)
+
+    def cancel(self, task_ids: list[str]) -> None:
+        self._call("cancel", task_ids)
+
+    def close(self) -> None:
+        with self._lock:
+            self._disconnect()
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def open_queue(spec: str, serve: bool = False):
+    """Queue for ``sqlite:///path`` or ``tcp://host:port``. With ``serve`` (the
+    coordinator side), a tcp spec starts serving an in-memory queue on that
+    address instead of connecting to one. TCP queues use the token in
+    PLETHORA_QUEUE_TOKEN."""
+    scheme, sep, rest = spec.partition("://")
+    if not sep:
+        raise ValueError(f"Queue spec must be sqlite:///path or tcp://host:port, got {spec!r}")
+    if scheme == "sqlite":
+        return SQLiteQueue(rest)
+    if scheme == "tcp":
+        host, _, port = rest.rstrip("/").rpartition(":")
+        if not port.isdigit():
+            raise ValueError(f"TCP queue spec needs a port: {spec!r}")
+        host = host or "127.0.0.1"
+        token = os.environ.get(TOKEN_ENV, "")
+        if serve:
+            return _ServedQueue(host, int(port), token=token)
+        return TCPQueue(host, int(port), token=token)
+    raise ValueError(f"Unknown queue backend {scheme!r} (use sqlite or tcp)")
+
+
+# ── Coordinator ──────────────────────────────────────────────────────────────
+
+class Coordinator:
+    """Submits scrape tasks to shard workers through ``queue`` and resolves a
+    Future per task as results come back, so run() can as_completed() them
+    like local work. A future is marked running once a worker has claimed
+    its task, so — as with local work — only tasks nobody has started can be
+    cancelled; cancelling one (as a run's deadline does) withdraws it from
+    the queue, and withdraw() gives up on started ones."""
+
+    def __init__(self, queue, num_shards: int, poll_interval: float = POLL_INTERVAL,
+                 log=print):
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1")
+        self.queue = queue
+        self.num_shards = num_shards
+        self.poll_interval = poll_interval
+        self.log = log
+        self._tag = secrets.token_hex(4)
+        self._seq = itertools.count()
+        self._pending: dict[str, tuple[Future, str]] = {}
+        self._running: set[str] = set()  # ids of pending tasks a worker has claimed
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._poller = None
+
+    def _submit(self, kind: str, route_url: str, payload: dict) -> Future:
+        task_id = f"{self._tag}-{next(self._seq)}"
+        future = Future()
+        with self._lock:
+            self._pending[task_id] = (future, kind)
+            if self._poller is None:
+                self._poller = threading.Thread(target=self._poll, daemon=True)
+                self._poller.start()
+        self.queue.put(task_id, shard_for(route_url, self.num_shards), {"kind": kind, **payload})
+        future.add_done_callback(lambda f: self._withdraw(task_id, f))
+        return future
+
+    def _withdraw(self, task_id: str, future: Future) -> None:
+        if not future.cancelled():
+            return
+        with self._lock:
+            self._pending.pop(task_id, None)
+        try:
+            self.queue.cancel([task_id])
+        except Exception:
+            pass  # the queue is closing; the task's result is dropped anyway
+
+    def withdraw(self, futures) -> None:
+        """Give up on the tasks behind ``futures`` (others are ignored), e.g.
+        those still running at a run's deadline: they leave the queue, a
+        result still arriving is dropped and the futures fail."""
+        futures = set(futures)
+        with self._lock:
+            ids = [t for t, (future, _kind) in self._pending.items() if future in futures]
+            withdrawn = [(t, self._pending.pop(t)[0]) for t in ids]
+            started = [future for t, future in withdrawn if t in self._running]
+            self._running.difference_update(ids)
+        for future in started:
+            future.set_exception(RuntimeError("task withdrawn before it finished"))
+        if ids:
+            try:
+                self.queue.cancel(ids)
+            except Exception:
+                pass  # the queue is closing; the results are dropped anyway
+
+    def submit_page(self, url: str, use_cache: bool = True, cache_ttl: int = 3600) -> Future:
+        """Future → the page dict, as scrape_page() would return it."""
+        return self._submit("page", url, {"url": url, "use_cache": use_cache, "cache_ttl": cache_ttl})
+
+    def submit_subpages(self, page, max_subpages: int, use_cache: bool = True,
+                        cache_ttl: int = 3600, exclude=frozenset()) -> Future:
+        """Future → (parent URL, sub-pages), as scrape_subpages() would find them."""
+        from scraper import canonical_url
+
+        # Only the page's own links can be passed over, so only those are sent.
+        links = {canonical_url(link["url"]) for link in page.get("links", [])}
+        return self._submit("subpages", page.get("final_url") or page["url"], {
+            "page": page, "max_subpages": max_subpages,
+            "use_cache": use_cache, "cache_ttl": cache_ttl,
+            "exclude": sorted(links & set(exclude)),
+        })
+
+    def _poll(self):
+        failing = False
+        while not self._stop.is_set():
+            with self._lock:
+                task_ids = list(self._pending)
+                waiting = [t for t in task_ids if t not in self._running]
+            try:
+                results = self.queue.take_results(task_ids) if task_ids else {}
+                started = self.queue.claimed(waiting) if waiting else []
+            except Exception as e:
+                # Results stay in the queue until a poll gets through
+                if not failing:
+                    self.log(f"[!] Queue poll failed, retrying: {e}")
+                failing, results, started = True, {}, []
+            else:
+                failing = False
+            for task_id in started:
+                with self._lock:
+                    future, _kind = self._pending.get(task_id, (None, None))
+                    if future is not None and task_id not in results \
+                            and future.set_running_or_notify_cancel():
+                        self._running.add(task_id)
+            for task_id, result in results.items():
+                with self._lock:
+                    future, kind = self._pending.pop(task_id, (None, None))
+                    running = task_id in self._running
+                    self._running.discard(task_id)
+                if future is None or not (running or future.set_running_or_notify_cancel()):
+                    continue  # cancelled meanwhile
+                try:
+                    if kind == "page":
+                        future.set_result(result["page"])
+                    else:
+                        future.set_result((result["parent"], result["subpages"]))
+                except (KeyError, TypeError) as e:
+                    future.set_exception(RuntimeError(f"malformed result for task {task_id}: {e!r}"))
+            if not results:
+                self._stop.wait(self.poll_interval)
+
+    def close(self) -> None:
+        """Stop polling; tasks still outstanding fail their futures."""
+        self._stop.set()
+        if self._poller is not None:
+            self._poller.join()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            running, self._running = self._running, set()
+        for task_id, (future, _kind) in pending.items():
+            if task_id in running or future.set_running_or_notify_cancel():
+                future.set_exception(RuntimeError("coordinator closed before the task finished"))
+        self.queue.close()
+
+
+# ── Worker ───────────────────────────────────────────────────────────────────
+
+def _execute(payload: dict) -> dict:
+    import scraper
+
+    if payload["kind"] == "page":
+        url = payload["url"]
+        try:
+            page = scraper.scrape_page(url, use_cache=payload["use_cache"],
+                                       cache_ttl=payload["cache_ttl"])
+        except Exception as e:
+            page = {"url": url, "error": str(e)}
+        return {"page": page}
+    page = payload["page"]
+    try:
+        subs = scraper.scrape_subpages(page, payload["max_subpages"], use_cache=payload["use_cache"],
+                                       cache_ttl=payload["cache_ttl"],
+                                       exclude=frozenset(payload.get("exclude", ())))
+    except Exception:
+        subs = []
+    return {"parent": page["url"], "subpages": subs}
+
+
+def run_worker(queue, shard: int, worker_id: str | None = None,
+               idle_exit: float | None = None, poll_interval: float = POLL_INTERVAL,
+               workers: int = 4, log=print) -> int:
+    """Serve tasks for ``shard`` until idle for ``idle_exit`` seconds (forever
+    if None), scraping up to ``workers`` claimed tasks concurrently. Returns
+    the number of tasks completed.
+
+    Queue errors (e.g. a dropped TCP connection) are logged and retried; a
+    task whose result could not be handed in is re-run once its lease
+    expires. Losing the shard to another worker stops this one."""
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    owner = queue.acquire_shard(shard, worker_id)
+    if owner != worker_id:
+        raise RuntimeError(f"Shard {shard} is already owned by worker {owner}")
+    log(f"[*] Worker {worker_id} serving shard {shard} ({workers} thread(s))")
+
+    # claim() renews the shard lease, but nothing is claimed while every
+    # thread is busy, so long fetches are covered by this timer.
+    stop = threading.Event()
+    lost_to: list[str] = []
+
+    def _renew():
+        while not stop.wait(LEASE_RENEW):
+            try:
+                owner = queue.acquire_shard(shard, worker_id)
+            except Exception as e:
+                log(f"[!] Shard lease renewal failed, retrying: {e}")
+                continue
+            if owner != worker_id:
+                lost_to.append(owner)
+                return
+
+    def _serve(task_id: str, payload: dict) -> dict:
+        queue.complete(task_id, _execute(payload))
+        return payload
+
+    completed = 0
+    running = set()
+    idle_since = time.monotonic()
+    threading.Thread(target=_renew, daemon=True).start()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while True:
+                if lost_to:
+                    raise RuntimeError(f"Shard {shard} was taken over by worker {lost_to[0]}")
+                # Claim only as many tasks as there are free threads, so the rest
+                # stay in the queue under no lease of ours
+                task = None
+                if len(running) < workers:
+                    try:
+                        task = queue.claim(shard, worker_id)
+                    except Exception as e:
+                        log(f"[!] Queue claim failed, retrying: {e}")
+                if task is not None:
+                    running.add(pool.submit(_serve, *task))
+                    continue
+                if not running:
+                    if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                        return completed
+                    time.sleep(poll_interval)
+                    continue
+                finished, running = wait(running, timeout=poll_interval,
+                                         return_when=FIRST_COMPLETED)
+                for future in finished:
+                    try:
+                        payload = future.result()
+                    except Exception as e:
+                        log(f"[!] Could not hand in a result, it will be re-run: {e}")
+                        continue
+                    completed += 1
+                    idle_since = time.monotonic()
+                    log(f"[+] {payload['kind']}: {(payload.get('url') or payload['page']['url'])[:70]}")
+    finally:
+        stop.set()
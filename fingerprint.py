@@ -0,0 +1,95 @@
+"""
+Near-duplicate detection for scraped pages (64-bit SimHash).
+
+A page's fingerprint is the SimHash of its extracted text over word
+3-gram shingles. Mirrors, syndicated copies and pages that differ only in
+boilerplate or query string land within a few bits of each other, so two
+pages are near-duplicates when their fingerprints differ in at most
+MAX_DISTANCE bits.
+
+FingerprintIndex finds such matches without a linear scan: the 64 bits are
+split into MAX_DISTANCE + 1 bands, and by pigeonhole any fingerprint within
+MAX_DISTANCE bits of another agrees with it exactly on at least one band.
+"""
+
+import hashlib
+import re
+import threading
+
+MAX_DISTANCE = 3        # bits; ≤3/64 is the usual near-duplicate threshold
+MIN_WORDS = 40          # shorter texts give unstable fingerprints — don't dedup them
+_SHINGLE = 3
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str) -> int | None:
+    """64-bit SimHash of ``text``, or None if it is too short to be meaningful."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < MIN_WORDS:
+        return None
+    shingles = {" ".join(words[i:i + _SHINGLE]) for i in range(len(words) - _SHINGLE + 1)}
+    # Transpose the 64-char bit strings so each bit column is counted in C
+    # rather than testing 64 bits per shingle in Python.
+    columns = zip(*(f"{_hash64(s):064b}" for s in shingles))
+    half = len(shingles) / 2
+    bits = "".join("1" if col.count("1") > half else "0" for col in columns)
+    return int(bits, 2)
+
+
+def distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def page_fingerprint(page: dict) -> int | None:
+    """Fingerprint stored on the page dict (hex, so it survives JSON), computing it if absent."""
+    fp = page.get("simhash")
+    if fp:
+        return int(fp, 16)
+    if page.get("error") or not page.get("text"):
+        return None
+    fp = simhash(page["text"])
+    if fp is not None:
+        page["simhash"] = f"{fp:016x}"
+    return fp
+
+
+class FingerprintIndex:
+    """Thread-safe index of fingerprints → first URL seen with them."""
+
+    def __init__(self, max_distance: int = MAX_DISTANCE):
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        self._band_bits = [(i * 64 // bands, (i + 1) * 64 // bands) for i in range(bands)]
+        self._bands: list[dict[int, list[tuple[int, str]]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+    def _band_keys(self, fp: int):
+        for i, (lo, hi) in enumerate(self._band_bits):
+            yield i, (fp >> lo) & ((1 << (hi - lo)) - 1)
+
+    def find(self, fp: int) -> str | None:
+        """URL of an indexed near-duplicate of ``fp``, if any."""
+        with self._lock:
+            return self._find(fp)
+
+    def _find(self, fp: int) -> str | None:
+        for i, key in self._band_keys(fp):
+            for other, url in self._bands[i].get(key, ()):
+                if distance(fp, other) <= self.max_distance:
+                    return url
+        return None
+
+    def add(self, fp: int, url: str) -> str | None:
+        """Index ``fp`` for ``url`` unless it is a near-duplicate; returns the
+        URL it duplicates, or None if it was new and has been added."""
+        with self._lock:
+            original = self._find(fp)
+            if original is not None:
+                return original
+            for i, key in self._band_keys(fp):
+                self._bands[i].setdefault(key, []).append((fp, url))
+            return None
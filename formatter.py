@@ -2,10 +2,11 @@
 Report formatter — generates txt, markdown, HTML, JSON, and PDF reports.
 """
 
-import json
 from datetime import datetime
 from html import escape as html_escape
 
+import serialization
+
 WATERMARK = "Plethora — made by Soumyadip Karforma"
 
 
@@ -13,6 +14,50 @@ def _truncate(text: str, max_len: int) -> str:
     return text[:max_len] + "…" if len(text) > max_len else text
 
 
+# ── Near-duplicates ──────────────────────────────────────────────────────────
+# Pages marked with "duplicate_of" are collapsed to a one-line reference.
+
+def _page_numbers(pages: list[dict]) -> dict[str, int]:
+    return {p["url"]: i for i, p in enumerate(pages, 1)}
+
+
+def _dup_ref(url: str, numbers: dict[str, int]) -> str:
+    n = numbers.get(url)
+    return f"[{n}]" if n else url
+
+
+def _dup_count(pages: list[dict], subpages: dict) -> int:
+    return (sum(1 for p in pages if p.get("duplicate_of"))
+            + sum(1 for subs in subpages.values() for sp in subs if sp.get("duplicate_of")))
+
+
+# ── Deadline notice ──────────────────────────────────────────────────────────
+# A run cut short by its deadline carries data["deadline"]; its skipped and
+# unfinished pages are listed as error entries, and the header says so.
+
+def _deadline_note(data: dict) -> str | None:
+    cut = data.get("deadline")
+    if not cut:
+        return None
+    parts = []
+    if cut["skipped"]:
+        parts.append(f"{len(cut['skipped'])} page(s) not fetched")
+    if cut["unfinished"]:
+        parts.append(f"{len(cut['unfinished'])} still loading")
+    if cut["search"] != "complete":
+        parts.append("search results cut short")
+    if cut["subpages"] == "dropped":
+        parts.append("sub-pages not expanded")
+    elif cut["subpages"] == "partial":
+        parts.append("some sub-pages missing")
+    return f"Partial report — {cut['seconds']:g}s deadline reached: {', '.join(parts)}"
+
+
+def _scraped_count(pages: list) -> int:
+    """Pages actually scraped: deadline placeholders are counted in the notice."""
+    return sum(1 for p in pages if not p.get("deadline"))
+
+
 # ── Text caps per level ──────────────────────────────────────────────────────
 
 _TEXT_CAP = {"low": 0, "medium": 500, "high": 2000}
@@ -35,6 +80,38 @@ def format_report(data: dict, fmt: str) -> str | bytes:
 #  TXT FORMAT
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _txt_page_body(page: dict, level: str) -> list[str]:
+    lines = []
+    if page.get("meta_description"):
+        lines.append(f"  Meta: {_truncate(page['meta_description'], 200)}")
+
+    # Headings
+    cap = _HEADING_CAP[level]
+    for h in page.get("headings", [])[:cap]:
+        indent = "    " + "  " * (h["level"] - 1)
+        lines.append(f"{indent}• {h['text']}")
+
+    # Lists (medium+)
+    for lst in page.get("lists", [])[:3]:
+        marker = "•" if lst["type"] == "ul" else "1."
+        for item in lst["items"][:5]:
+            lines.append(f"    {marker} {_truncate(item, 120)}")
+
+    # Text
+    text = page.get("text", "")
+    text_cap = _TEXT_CAP[level]
+    if text and text_cap:
+        label = "Content Preview" if level == "medium" else "Content"
+        lines.append(f"\n  ── {label} ──")
+        lines.append(f"  {_truncate(text, text_cap)}")
+
+    # Images (high only)
+    if level == "high":
+        for img in page.get("images", [])[:5]:
+            lines.append(f"  🖼 {img['alt'][:80]} — {img['src'][:60]}")
+    return lines
+
+
 def _fmt_txt(data: dict) -> str:
     query = data["query"]
     level = data["level"]
@@ -51,9 +128,15 @@ def _fmt_txt(data: dict) -> str:
         f" Results: {len(results)}",
     ]
     if pages:
-        lines.append(f" Pages scraped: {len(pages)}")
+        lines.append(f" Pages scraped: {_scraped_count(pages)}")
     if subpages:
         lines.append(f" Sub-pages scraped: {sum(len(v) for v in subpages.values())}")
+    dups = _dup_count(pages, subpages)
+    if dups:
+        lines.append(f" Near-duplicates collapsed: {dups}")
+    note = _deadline_note(data)
+    if note:
+        lines.append(f" ⚠ {note}")
     lines.append(f" {WATERMARK}")
     lines.append(f"{'='*60}\n")
 
@@ -66,6 +149,7 @@ def _fmt_txt(data: dict) -> str:
             lines.append("")
         return "\n".join(lines)
 
+    numbers = _page_numbers(pages)
     for i, page in enumerate(pages, 1):
         sep = "━" if level == "high" else "─"
         lines.append(f"{sep*60}")
@@ -74,33 +158,10 @@ def _fmt_txt(data: dict) -> str:
         if page.get("error"):
             lines.append(f"  ⚠ Error: {page['error']}\n")
             continue
-        if page.get("meta_description"):
-            lines.append(f"  Meta: {_truncate(page['meta_description'], 200)}")
-
-        # Headings
-        cap = _HEADING_CAP[level]
-        for h in page.get("headings", [])[:cap]:
-            indent = "    " + "  " * (h["level"] - 1)
-            lines.append(f"{indent}• {h['text']}")
-
-        # Lists (medium+)
-        for lst in page.get("lists", [])[:3]:
-            marker = "•" if lst["type"] == "ul" else "1."
-            for item in lst["items"][:5]:
-                lines.append(f"    {marker} {_truncate(item, 120)}")
-
-        # Text
-        text = page.get("text", "")
-        text_cap = _TEXT_CAP[level]
-        if text and text_cap:
-            label = "Content Preview" if level == "medium" else "Content"
-            lines.append(f"\n  ── {label} ──")
-            lines.append(f"  {_truncate(text, text_cap)}")
-
-        # Images (high only)
-        if level == "high":
-            for img in page.get("images", [])[:5]:
-                lines.append(f"  🖼 {img['alt'][:80]} — {img['src'][:60]}")
+        if page.get("duplicate_of"):
+            lines.append(f"  ≈ Near-duplicate of {_dup_ref(page['duplicate_of'], numbers)}\n")
+            continue
+        lines.extend(_txt_page_body(page, level))
 
         # Sub-pages (high only)
         subs = subpages.get(page["url"], [])
@@ -110,7 +171,9 @@ def _fmt_txt(data: dict) -> str:
                 lines.append(f"    ┌ Sub-page {j}: {sp.get('title', 'N/A')}")
                 lines.append(f"    │ URL: {sp['url']}")
                 sp_text = sp.get("text", "")
-                if sp_text:
+                if sp.get("duplicate_of"):
+                    lines.append(f"    │ ≈ Near-duplicate of {_dup_ref(sp['duplicate_of'], numbers)}")
+                elif sp_text:
                     lines.append(f"    │ {_truncate(sp_text, _SUB_TEXT_CAP)}")
                 lines.append(f"    └{'─'*40}")
         lines.append("")
@@ -121,6 +184,49 @@ def _fmt_txt(data: dict) -> str:
 #  MARKDOWN FORMAT
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _md_page_body(page: dict, level: str) -> list[str]:
+    lines = []
+    if page.get("meta_description"):
+        lines.append(f"*{_truncate(page['meta_description'], 200)}*\n")
+
+    cap = _HEADING_CAP[level]
+    if page.get("headings"):
+        lines.append("### Structure")
+        for h in page.get("headings", [])[:cap]:
+            indent = "  " * (h["level"] - 1)
+            lines.append(f"{indent}- {h['text']}")
+        lines.append("")
+
+    # Lists
+    for lst in page.get("lists", [])[:3]:
+        for item in lst["items"][:5]:
+            lines.append(f"- {_truncate(item, 120)}")
+        lines.append("")
+
+    # Tables
+    for table in page.get("tables", [])[:2]:
+        if table:
+            lines.append("| " + " | ".join(table[0]) + " |")
+            lines.append("| " + " | ".join(["---"] * len(table[0])) + " |")
+            for row in table[1:6]:
+                lines.append("| " + " | ".join(row) + " |")
+            lines.append("")
+
+    text = page.get("text", "")
+    text_cap = _TEXT_CAP[level]
+    if text and text_cap:
+        lines.append("### Content\n")
+        lines.append(_truncate(text, text_cap))
+        lines.append("")
+
+    if level == "high":
+        for img in page.get("images", [])[:5]:
+            lines.append(f"- 🖼 **{img['alt'][:80]}** — `{img['src'][:60]}`")
+        if page.get("images"):
+            lines.append("")
+    return lines
+
+
 def _fmt_md(data: dict) -> str:
     query = data["query"]
     level = data["level"]
@@ -137,9 +243,15 @@ def _fmt_md(data: dict) -> str:
         f"- **Results:** {len(results)}",
     ]
     if pages:
-        lines.append(f"- **Pages scraped:** {len(pages)}")
+        lines.append(f"- **Pages scraped:** {_scraped_count(pages)}")
     if subpages:
         lines.append(f"- **Sub-pages:** {sum(len(v) for v in subpages.values())}")
+    dups = _dup_count(pages, subpages)
+    if dups:
+        lines.append(f"- **Near-duplicates collapsed:** {dups}")
+    note = _deadline_note(data)
+    if note:
+        lines.append(f"\n> ⚠️ **{note}**")
     lines.append(f"\n*{WATERMARK}*")
     lines.append("\n---\n")
 
@@ -151,50 +263,18 @@ def _fmt_md(data: dict) -> str:
                 lines.append(f"\n> {r['snippet']}\n")
         return "\n".join(lines)
 
+    numbers = _page_numbers(pages)
     for i, page in enumerate(pages, 1):
         lines.append(f"## {i}. {page.get('title', 'N/A')}")
         lines.append(f"🔗 {page['url']}\n")
         if page.get("error"):
             lines.append(f"> ⚠️ **Error:** {page['error']}\n")
             continue
-        if page.get("meta_description"):
-            lines.append(f"*{_truncate(page['meta_description'], 200)}*\n")
-
-        cap = _HEADING_CAP[level]
-        if page.get("headings"):
-            lines.append("### Structure")
-            for h in page.get("headings", [])[:cap]:
-                indent = "  " * (h["level"] - 1)
-                lines.append(f"{indent}- {h['text']}")
-            lines.append("")
-
-        # Lists
-        for lst in page.get("lists", [])[:3]:
-            for item in lst["items"][:5]:
-                lines.append(f"- {_truncate(item, 120)}")
-            lines.append("")
-
-        # Tables
-        for table in page.get("tables", [])[:2]:
-            if table:
-                lines.append("| " + " | ".join(table[0]) + " |")
-                lines.append("| " + " | ".join(["---"] * len(table[0])) + " |")
-                for row in table[1:6]:
-                    lines.append("| " + " | ".join(row) + " |")
-                lines.append("")
-
-        text = page.get("text", "")
-        text_cap = _TEXT_CAP[level]
-        if text and text_cap:
-            lines.append("### Content\n")
-            lines.append(_truncate(text, text_cap))
-            lines.append("")
-
-        if level == "high":
-            for img in page.get("images", [])[:5]:
-                lines.append(f"- 🖼 **{img['alt'][:80]}** — `{img['src'][:60]}`")
-            if page.get("images"):
-                lines.append("")
+        if page.get("duplicate_of"):
+            lines.append(f"> ≈ Near-duplicate of {_dup_ref(page['duplicate_of'], numbers)}\n")
+            lines.append("---\n")
+            continue
+        lines.extend(_md_page_body(page, level))
 
         subs = subpages.get(page["url"], [])
         if subs:
@@ -203,7 +283,9 @@ def _fmt_md(data: dict) -> str:
                 lines.append(f"#### ↳ {sp.get('title', 'N/A')}")
                 lines.append(f"🔗 {sp['url']}\n")
                 sp_text = sp.get("text", "")
-                if sp_text:
+                if sp.get("duplicate_of"):
+                    lines.append(f"> ≈ Near-duplicate of {_dup_ref(sp['duplicate_of'], numbers)}\n")
+                elif sp_text:
                     lines.append(_truncate(sp_text, _SUB_TEXT_CAP))
                     lines.append("")
         lines.append("---\n")
@@ -236,6 +318,7 @@ _HTML_CSS = """
   .headings li { color: var(--fg); font-size: .9rem; }
   .content { margin-top: .5rem; font-size: .9rem; white-space: pre-wrap; color: #b0b8c1; }
   .error { color: var(--red); }
+  .dup { color: #8b949e; font-style: italic; margin-top: .3rem; font-size: .9rem; }
   .subpage { margin-left: 1.2rem; border-left: 2px solid var(--border); padding-left: 1rem; margin-top: .5rem; }
   .subpage h3 { color: var(--green); font-size: .95rem; }
   .img-list { font-size: .85rem; color: #8b949e; margin-top: .3rem; }
@@ -247,6 +330,35 @@ _HTML_CSS = """
 """
 
 
+def _html_page_body(page: dict, level: str) -> list[str]:
+    e = html_escape
+    parts = []
+    if page.get("meta_description"):
+        parts.append(f"  <div class='meta-desc'>{e(_truncate(page['meta_description'], 200))}</div>")
+
+    cap = _HEADING_CAP[level]
+    headings = page.get("headings", [])[:cap]
+    if headings:
+        parts.append("  <ul class='headings'>")
+        for h in headings:
+            parts.append(f"    <li style='margin-left:{(h['level']-1)*1.2}rem'>{e(h['text'])}</li>")
+        parts.append("  </ul>")
+
+    text = page.get("text", "")
+    text_cap = _TEXT_CAP[level]
+    if text and text_cap:
+        parts.append(f"  <div class='content'>{e(_truncate(text, text_cap))}</div>")
+
+    if level == "high":
+        imgs = page.get("images", [])[:5]
+        if imgs:
+            parts.append("  <div class='img-list'>")
+            for img in imgs:
+                parts.append(f"    🖼 {e(img['alt'][:80])}<br>")
+            parts.append("  </div>")
+    return parts
+
+
 def _fmt_html(data: dict) -> str:
     query = data["query"]
     level = data["level"]
@@ -268,10 +380,16 @@ def _fmt_html(data: dict) -> str:
         f"  <span>🔗 {len(results)} results</span>",
     ]
     if pages:
-        parts.append(f"  <span>📄 {len(pages)} pages</span>")
+        parts.append(f"  <span>📄 {_scraped_count(pages)} pages</span>")
     if subpages:
         parts.append(f"  <span>📎 {sum(len(v) for v in subpages.values())} sub-pages</span>")
+    dups = _dup_count(pages, subpages)
+    if dups:
+        parts.append(f"  <span>≈ {dups} near-duplicates collapsed</span>")
     parts.append("</div>")
+    note = _deadline_note(data)
+    if note:
+        parts.append(f"<p class='error'>⚠ {e(note)}</p>")
 
     if level == "low":
         for i, r in enumerate(results, 1):
@@ -282,6 +400,7 @@ def _fmt_html(data: dict) -> str:
                 parts.append(f"  <p>{e(r['snippet'])}</p>")
             parts.append("</div>")
     else:
+        numbers = _page_numbers(pages)
         for i, page in enumerate(pages, 1):
             parts.append(f"<div class='card'>")
             parts.append(f"  <h2>{i}. {e(page.get('title', 'N/A'))}</h2>")
@@ -290,29 +409,11 @@ def _fmt_html(data: dict) -> str:
                 parts.append(f"  <p class='error'>⚠ {e(page['error'])}</p>")
                 parts.append("</div>")
                 continue
-            if page.get("meta_description"):
-                parts.append(f"  <div class='meta-desc'>{e(_truncate(page['meta_description'], 200))}</div>")
-
-            cap = _HEADING_CAP[level]
-            headings = page.get("headings", [])[:cap]
-            if headings:
-                parts.append("  <ul class='headings'>")
-                for h in headings:
-                    parts.append(f"    <li style='margin-left:{(h['level']-1)*1.2}rem'>{e(h['text'])}</li>")
-                parts.append("  </ul>")
-
-            text = page.get("text", "")
-            text_cap = _TEXT_CAP[level]
-            if text and text_cap:
-                parts.append(f"  <div class='content'>{e(_truncate(text, text_cap))}</div>")
-
-            if level == "high":
-                imgs = page.get("images", [])[:5]
-                if imgs:
-                    parts.append("  <div class='img-list'>")
-                    for img in imgs:
-                        parts.append(f"    🖼 {e(img['alt'][:80])}<br>")
-                    parts.append("  </div>")
+            if page.get("duplicate_of"):
+                parts.append(f"  <p class='dup'>≈ Near-duplicate of {e(_dup_ref(page['duplicate_of'], numbers))}</p>")
+                parts.append("</div>")
+                continue
+            parts.extend(_html_page_body(page, level))
 
             subs = subpages.get(page["url"], [])
             for j, sp in enumerate(subs, 1):
@@ -320,7 +421,9 @@ def _fmt_html(data: dict) -> str:
                 parts.append(f"    <h3>↳ {e(sp.get('title', 'N/A'))}</h3>")
                 parts.append(f"    <div class='url'><a href='{e(sp['url'])}'>{e(sp['url'])}</a></div>")
                 sp_text = sp.get("text", "")
-                if sp_text:
+                if sp.get("duplicate_of"):
+                    parts.append(f"    <p class='dup'>≈ Near-duplicate of {e(_dup_ref(sp['duplicate_of'], numbers))}</p>")
+                elif sp_text:
                     parts.append(f"    <div class='content'>{e(_truncate(sp_text, _SUB_TEXT_CAP))}</div>")
                 parts.append("  </div>")
 
@@ -347,7 +450,9 @@ def _fmt_json(data: dict) -> str:
         out["pages"] = data["pages"]
     if data.get("subpages"):
         out["subpages"] = data["subpages"]
-    return json.dumps(out, indent=2, ensure_ascii=False, default=str)
+    if data.get("deadline"):
+        out["deadline"] = data["deadline"]
+    return serialization.dumps(out, indent=True).decode("utf-8")
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -400,10 +505,18 @@ def _fmt_pdf(data: dict) -> bytes:
     pdf.cell(0, 6, _safe(f"Date: {now}"), new_x="LMARGIN", new_y="NEXT")
     pdf.cell(0, 6, _safe(f"Results: {len(results)}"), new_x="LMARGIN", new_y="NEXT")
     if pages:
-        pdf.cell(0, 6, _safe(f"Pages scraped: {len(pages)}"), new_x="LMARGIN", new_y="NEXT")
+        pdf.cell(0, 6, _safe(f"Pages scraped: {_scraped_count(pages)}"), new_x="LMARGIN", new_y="NEXT")
     if subpages:
         total_sub = sum(len(v) for v in subpages.values())
         pdf.cell(0, 6, _safe(f"Sub-pages: {total_sub}"), new_x="LMARGIN", new_y="NEXT")
+    dups = _dup_count(pages, subpages)
+    if dups:
+        pdf.cell(0, 6, _safe(f"Near-duplicates collapsed: {dups}"), new_x="LMARGIN", new_y="NEXT")
+    note = _deadline_note(data)
+    if note:
+        pdf.set_text_color(200, 50, 50)
+        pdf.multi_cell(0, 6, _safe(note))
+        pdf.set_text_color(0, 0, 0)
     pdf.ln(4)
 
     # ── Low: just search results ──
@@ -422,6 +535,7 @@ def _fmt_pdf(data: dict) -> bytes:
         return pdf.output()
 
     # ── Medium / High ──
+    numbers = _page_numbers(pages)
     for i, page in enumerate(pages, 1):
         pdf.set_draw_color(180, 180, 180)
         pdf.line(10, pdf.get_y(), 200, pdf.get_y())
@@ -441,6 +555,15 @@ def _fmt_pdf(data: dict) -> bytes:
             pdf.ln(3)
             continue
 
+        if page.get("duplicate_of"):
+            pdf.set_font("Helvetica", "I", 9)
+            pdf.set_text_color(120, 120, 120)
+            pdf.cell(0, 6, _safe(f"Near-duplicate of {_dup_ref(page['duplicate_of'], numbers)[:90]}"),
+                     new_x="LMARGIN", new_y="NEXT")
+            pdf.set_text_color(0, 0, 0)
+            pdf.ln(3)
+            continue
+
         if page.get("meta_description"):
             pdf.set_font("Helvetica", "I", 9)
             pdf.multi_cell(0, 5, _safe(_truncate(page["meta_description"], 200)))
@@ -475,7 +598,11 @@ def _fmt_pdf(data: dict) -> bytes:
                 pdf.cell(0, 4, _safe(f"    {sp['url'][:90]}"), new_x="LMARGIN", new_y="NEXT")
                 pdf.set_text_color(0, 0, 0)
                 sp_text = sp.get("text", "")
-                if sp_text:
+                if sp.get("duplicate_of"):
+                    pdf.set_font("Helvetica", "I", 8)
+                    pdf.cell(0, 4, _safe(f"    Near-duplicate of {_dup_ref(sp['duplicate_of'], numbers)[:80]}"),
+                             new_x="LMARGIN", new_y="NEXT")
+                elif sp_text:
                     pdf.set_font("Helvetica", "", 8)
                     pdf.multi_cell(0, 4, _safe(_truncate(sp_text, _SUB_TEXT_CAP)))
                 pdf.ln(2)
@@ -0,0 +1,166 @@
+"""
+Append-only run journal for checkpointed, resumable runs.
+
+Each run writes one JSON-lines file, ``<journal_dir>/<run_id>.jsonl``:
+
+  {"type": "start", "params": {...}}            run parameters
+  {"type": "search_result", "result": {...}}    one per result, rank order
+  {"type": "search_done"}                       search stage complete
+  {"type": "page", "page": {...}}               a finished page (incl. errors)
+  {"type": "subpages", "parent": url, "subpages": [...]}
+
+Records are flushed as they are written, so a killed process loses at most
+the record it was writing; a truncated last line is ignored on load and cut
+off when the run is resumed, so new records start on a line of their own.
+Replaying the journal gives back the search results, finished pages and
+sub-pages, and run() re-queues only what is missing.
+"""
+
+import os
+import secrets
+import threading
+from datetime import datetime
+
+import serialization
+
+
+def new_run_id() -> str:
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(3)}"
+
+
+class JournalState:
+    """What a journal says has already been done."""
+
+    def __init__(self):
+        self.params: dict = {}
+        self.search_results: list[dict] = []
+        self.search_done = False
+        self.pages: dict[str, dict] = {}
+        self.subpages: dict[str, list[dict]] = {}
+
+
+def load_journal(path: str) -> JournalState:
+    state = JournalState()
+    seen_results: set[str] = set()
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                rec = serialization.loads(line)
+            except ValueError:
+                continue  # torn write from a crash
+            kind = rec.get("type")
+            if kind == "start":
+                state.params = rec["params"]
+            elif kind == "search_result":
+                url = rec["result"]["url"]
+                if url not in seen_results:
+                    seen_results.add(url)
+                    state.search_results.append(rec["result"])
+            elif kind == "search_done":
+                state.search_done = True
+            elif kind == "page":
+                state.pages[rec["page"]["url"]] = rec["page"]
+            elif kind == "subpages":
+                state.subpages[rec["parent"]] = rec["subpages"]
+    return state
+
+
+def _truncate_torn_tail(path: str) -> None:
+    """Cut a partial last record (no trailing newline) left by a crash."""
+    with open(path, "r+b") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+
+
+class RunJournal:
+    """Writer for one run's journal; safe to call from any thread."""
+
+    enabled = True
+
+    def __init__(self, run_id: str, path: str, state: JournalState):
+        self.run_id = run_id
+        self.path = path
+        self.state = state
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+
+    @classmethod
+    def create(cls, run_id: str, journal_dir: str, params: dict) -> "RunJournal":
+        os.makedirs(journal_dir, exist_ok=True)
+        path = os.path.join(journal_dir, f"{run_id}.jsonl")
+        if os.path.exists(path):
+            raise FileExistsError(f"Run journal already exists: {path}")
+        state = JournalState()
+        state.params = params
+        journal = cls(run_id, path, state)
+        journal._write({"type": "start", "params": params})
+        return journal
+
+    @classmethod
+    def resume(cls, run_id: str, journal_dir: str) -> "RunJournal":
+        path = os.path.join(journal_dir, f"{run_id}.jsonl")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No journal for run {run_id} (finished runs are not kept)")
+        state = load_journal(path)
+        if not state.params:
+            raise ValueError(f"Run journal {path} has no start record")
+        _truncate_torn_tail(path)
+        return cls(run_id, path, state)
+
+    def _write(self, record: dict) -> None:
+        line = serialization.dumps(record)
+        with self._lock:
+            self._file.write(line + b"\n")
+            self._file.flush()
+
+    def search_result(self, result: dict) -> None:
+        self._write({"type": "search_result", "result": result})
+
+    def search_done(self) -> None:
+        self._write({"type": "search_done"})
+
+    def page(self, page: dict) -> None:
+        self._write({"type": "page", "page": page})
+
+    def subpages(self, parent_url: str, subs: list[dict]) -> None:
+        self._write({"type": "subpages", "parent": parent_url, "subpages": subs})
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+    def discard(self) -> None:
+        """Close and delete the journal — called once the run's reports are saved."""
+        self.close()
+        os.remove(self.path)
+
+
+class _NullJournal:
+    """Stand-in used when journaling is off."""
+
+    enabled = False
+    run_id = None
+    state = JournalState()
+
+    def search_result(self, result: dict) -> None:
+        pass
+
+    def search_done(self) -> None:
+        pass
+
+    def page(self, page: dict) -> None:
+        pass
+
+    def subpages(self, parent_url: str, subs: list[dict]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def discard(self) -> None:
+        pass
+
+
+NULL_JOURNAL = _NullJournal()
@@ -0,0 +1,119 @@
+"""
+Local full-text index over scraped pages (SQLite FTS5).
+
+Every page written to the URL cache is also indexed here under its canonical
+URL, so "which pages have I already scraped that mention X" is a local query
+instead of a new search. Re-scraping a page replaces its entry.
+
+  pages       canonical URL → url, title, indexed_at (unix time)
+  pages_fts   title / description / headings / body — BM25-ranked,
+              porter-stemmed, diacritics folded
+
+The body column holds the page's extracted text, so snippets come straight
+from the index; the full page (links, tables, ...) stays in the URL cache.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# BM25 weights for the FTS columns: title, description, headings, body
+_WEIGHTS = (10.0, 4.0, 3.0, 1.0)
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    id         INTEGER PRIMARY KEY,
+    canonical  TEXT NOT NULL UNIQUE,
+    url        TEXT NOT NULL,
+    title      TEXT,
+    indexed_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    title, description, headings, body,
+    tokenize = 'porter unicode61 remove_diacritics 2'
+);
+"""
+
+
+def fts_query(terms: str) -> str:
+    """Search terms → FTS5 MATCH expression. Every word must occur (implicit
+    AND); words are quoted, so operators and punctuation in the input are
+    matched as text rather than parsed as query syntax."""
+    return " ".join(f'"{w}"' for w in _WORD_RE.findall(terms))
+
+
+class LocalIndex:
+    """One index database; safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def add(self, page, canonical: str) -> bool:
+        """Index (or re-index) ``page`` under ``canonical``. Error pages and
+        pages without text are skipped; returns whether the page was indexed."""
+        if page.get("error") or not page.get("text"):
+            return False
+        url = page.get("final_url") or page["url"]
+        title = page.get("title") or ""
+        fields = (
+            title,
+            page.get("meta_description") or "",
+            " ".join(h["text"] for h in page.get("headings", [])),
+            page["text"],
+        )
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM pages WHERE canonical = ?", (canonical,)).fetchone()
+            if row:
+                doc_id = row[0]
+                self._conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (doc_id,))
+                self._conn.execute(
+                    "UPDATE pages SET url = ?, title = ?, indexed_at = ? WHERE id = ?",
+                    (url, title, time.time(), doc_id))
+            else:
+                doc_id = self._conn.execute(
+                    "INSERT INTO pages (canonical, url, title, indexed_at) VALUES (?, ?, ?, ?)",
+                    (canonical, url, title, time.time())).lastrowid
+            self._conn.execute(
+                "INSERT INTO pages_fts (rowid, title, description, headings, body) "
+                "VALUES (?, ?, ?, ?, ?)", (doc_id, *fields))
+        return True
+
+    def search(self, terms: str, limit: int = 10, mark: tuple[str, str] = ("[", "]")) -> list[dict]:
+        """Best matches first: {url, title, snippet, score, indexed_at}.
+        Higher ``score`` is better; matched words in the snippet are wrapped
+        in ``mark``."""
+        query = fts_query(terms)
+        if not query:
+            return []
+        sql = (
+            "SELECT p.url, p.title, p.indexed_at, "
+            "       snippet(pages_fts, -1, ?, ?, ' … ', 24), "
+            f"      bm25(pages_fts, {', '.join(map(str, _WEIGHTS))}) AS rank "
+            "FROM pages_fts JOIN pages p ON p.id = pages_fts.rowid "
+            "WHERE pages_fts MATCH ? ORDER BY rank LIMIT ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(sql, (*mark, query, limit)).fetchall()
+        return [
+            {"url": url, "title": title or "", "snippet": snippet,
+             "score": round(-rank, 6), "indexed_at": indexed_at}
+            for url, title, indexed_at, snippet, rank in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,258 @@
+"""
+Counters, gauges and histograms for long-running / cron deployments.
+
+run() records into the MetricsRegistry it is given; without one it uses the
+no-op NULL_METRICS, whose metric objects ignore every call, so disabled
+metrics cost one method call per event.
+
+Export:
+  render_prometheus()   Prometheus text exposition format (v0.0.4)
+  write_prometheus()    atomic file write — for node_exporter's textfile collector
+  serve()               background HTTP endpoint serving /metrics
+  push_statsd()         one UDP datagram per line, StatsD wire format
+"""
+
+import os
+import socket
+import threading
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(labels: tuple, extra: tuple = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in items) + "}"
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str = ""):
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+
+    @staticmethod
+    def _key(labels: dict) -> tuple:
+        return tuple(sorted(labels.items()))
+
+    def _header(self) -> list[str]:
+        lines = []
+        if self.help:
+            lines.append(f"# HELP {self.name} {self.help}")
+        lines.append(f"# TYPE {self.name} {self.kind}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [f"{self.name}{_label_str(k)} {_fmt_value(v)}" for k, v in items]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._values.items())
+        lines = self._header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                lines.append(f"{self.name}_bucket{_label_str(key, (('le', _fmt_value(bound)),))} {cumulative}")
+            lines.append(f"{self.name}_bucket{_label_str(key, (('le', '+Inf'),))} {count}")
+            lines.append(f"{self.name}_sum{_label_str(key)} {_fmt_value(total)}")
+            lines.append(f"{self.name}_count{_label_str(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Get-or-create registry of named metrics; safe to use from any thread."""
+
+    enabled = True
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, help, **kwargs)
+        return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets: tuple = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    # ── Export ───────────────────────────────────────────────────────────
+
+    def render_prometheus(self) -> str:
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str) -> str:
+        """Write the text format atomically (temp file + rename), so a scraper
+        reading the file never sees a partial write."""
+        import tempfile
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".metrics-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    def statsd_lines(self, prefix: str = "plethora") -> list[str]:
+        """StatsD-style lines. Labels become dotted name segments; histograms
+        are flattened to their running count and sum. Counters are sent as
+        totals, so push a given registry once (e.g. at the end of a run)."""
+        lines = []
+        for name in sorted(self._metrics):
+            metric = self._metrics[name]
+            base = f"{prefix}.{name.removeprefix(prefix + '_')}" if prefix else name
+            with metric._lock:
+                items = sorted(metric._values.items())
+            for key, value in items:
+                path = base + "".join("." + str(v).replace(".", "_").replace(":", "_") for _k, v in key)
+                if isinstance(metric, Histogram):
+                    lines.append(f"{path}.count:{value[2]}|g")
+                    lines.append(f"{path}.sum:{_fmt_value(value[1])}|g")
+                elif isinstance(metric, Gauge):
+                    lines.append(f"{path}:{_fmt_value(value)}|g")
+                else:
+                    lines.append(f"{path}:{_fmt_value(value)}|c")
+        return lines
+
+    def push_statsd(self, host: str = "127.0.0.1", port: int = 8125, prefix: str = "plethora") -> int:
+        """Send every line as a UDP datagram. Returns the number of lines sent."""
+        lines = self.statsd_lines(prefix)
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for line in lines:
+                sock.sendto(line.encode(), (host, port))
+        return len(lines)
+
+    def serve(self, port: int = 9464, host: str = "0.0.0.0") -> "ThreadingHTTPServer":
+        """Serve /metrics from a daemon thread. Call .shutdown() on the result to stop."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# ── Disabled registry ────────────────────────────────────────────────────────
+
+class _NullMetric:
+    def inc(self, amount: float = 1, **labels) -> None:
+        pass
+
+    def set(self, value: float, **labels) -> None:
+        pass
+
+    def observe(self, value: float, **labels) -> None:
+        pass
+
+
+class _NullRegistry:
+    """Stand-in used when metrics are off — every metric is a shared no-op."""
+
+    enabled = False
+    _metric = _NullMetric()
+
+    def counter(self, name: str, help: str = ""):
+        return self._metric
+
+    def gauge(self, name: str, help: str = ""):
+        return self._metric
+
+    def histogram(self, name: str, help: str = "", buckets: tuple = DEFAULT_BUCKETS):
+        return self._metric
+
+
+NULL_METRICS = _NullRegistry()
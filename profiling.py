@@ -0,0 +1,167 @@
+"""
+Lightweight hot-path timing for the scrape pipeline.
+
+A Profiler collects timed spans (stage name, start, duration, thread, URL)
+from any thread. run() installs one for the duration of a run; when none is
+installed the no-op NULL_PROFILER is used, so instrumentation costs a
+method call per span.
+
+Output:
+  format_summary()      per-stage table: count, total, mean, p50, p95, max
+  dump_chrome_trace()   Chrome trace-event JSON — open in chrome://tracing
+                        or https://ui.perfetto.dev for a flame-style view
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Display order for the summary table; unknown stages are listed after these.
+STAGE_ORDER = [
+    "search_page", "prewarm", "queue_wait", "page", "inflight_wait", "cache_get", "robots",
+    "robots_lock_wait", "rate_limit_wait", "dns", "connect", "ttfb", "download", "decode", "parse",
+    "extract", "fingerprint", "cache_put", "index",
+]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class Profiler:
+    """Thread-safe span recorder. Spans carry the URL they were recorded for;
+    nested spans without an explicit URL inherit the enclosing span's URL."""
+
+    enabled = True
+
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._events: list[tuple[str, float, float, int, str | None]] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_names: dict[int, str] = {}
+
+    def _current_url(self) -> str | None:
+        stack = getattr(self._local, "urls", None)
+        return stack[-1] if stack else None
+
+    def add(self, name: str, start: float, end: float, url: str | None = None) -> None:
+        """Record a span from two time.perf_counter() readings."""
+        tid = threading.get_ident()
+        event = (name, start, end - start, tid, url or self._current_url())
+        with self._lock:
+            self._events.append(event)
+            if tid not in self._thread_names:
+                self._thread_names[tid] = threading.current_thread().name
+
+    @contextmanager
+    def span(self, name: str, url: str | None = None):
+        """Time the enclosed block as stage ``name``."""
+        if url is not None:
+            stack = getattr(self._local, "urls", None)
+            if stack is None:
+                stack = self._local.urls = []
+            stack.append(url)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter(), url)
+            if url is not None:
+                self._local.urls.pop()
+
+    # ── Reporting ────────────────────────────────────────────────────────
+
+    def summary(self) -> list[dict]:
+        """Aggregate spans per stage. Times are in milliseconds."""
+        by_stage: dict[str, list[float]] = {}
+        with self._lock:
+            for name, _start, dur, _tid, _url in self._events:
+                by_stage.setdefault(name, []).append(dur * 1000)
+        order = {name: i for i, name in enumerate(STAGE_ORDER)}
+        rows = []
+        for name in sorted(by_stage, key=lambda n: (order.get(n, len(order)), n)):
+            durs = by_stage[name]
+            rows.append({
+                "stage": name,
+                "count": len(durs),
+                "total_ms": round(sum(durs), 2),
+                "mean_ms": round(sum(durs) / len(durs), 2),
+                "p50_ms": round(_percentile(durs, 50), 2),
+                "p95_ms": round(_percentile(durs, 95), 2),
+                "max_ms": round(max(durs), 2),
+            })
+        return rows
+
+    def url_timings(self) -> dict[str, dict[str, float]]:
+        """Total milliseconds per stage for each URL."""
+        out: dict[str, dict[str, float]] = {}
+        with self._lock:
+            for name, _start, dur, _tid, url in self._events:
+                if url:
+                    stages = out.setdefault(url, {})
+                    stages[name] = round(stages.get(name, 0.0) + dur * 1000, 2)
+        return out
+
+    def format_summary(self) -> str:
+        rows = self.summary()
+        header = f"  {'stage':<22}{'count':>7}{'total s':>10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"
+        lines = [header, "  " + "─" * (len(header) - 2)]
+        for r in rows:
+            lines.append(
+                f"  {r['stage']:<22}{r['count']:>7}{r['total_ms'] / 1000:>10.2f}"
+                f"{r['mean_ms']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['max_ms']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        pid = os.getpid()
+        other = {"summary": self.summary(), "urls": self.url_timings()}
+        events = []
+        with self._lock:
+            for tid, tname in self._thread_names.items():
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                               "args": {"name": tname}})
+            for name, start, dur, tid, url in self._events:
+                event = {
+                    "name": name, "cat": "plethora", "ph": "X", "pid": pid, "tid": tid,
+                    "ts": round((start - self._t0) * 1e6, 1), "dur": round(dur * 1e6, 1),
+                }
+                if url:
+                    event["args"] = {"url": url}
+                events.append(event)
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": other,
+        }
+
+    def dump_chrome_trace(self, path: str) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+class _NullProfiler:
+    """Stand-in used when profiling is off — every call is a no-op."""
+
+    enabled = False
+    _null = nullcontext()
+
+    def add(self, name: str, start: float, end: float, url: str | None = None) -> None:
+        pass
+
+    def span(self, name: str, url: str | None = None):
+        return self._null
+
+
+NULL_PROFILER = _NullProfiler()
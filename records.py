@@ -0,0 +1,175 @@
+"""
+Compact page records for large runs.
+
+scrape_page returns a dict of lists of small dicts (headings, lists, images,
+links). For a --level high run with 100 results and their sub-pages, the
+per-object overhead of those dicts is a large share of peak RSS, and run()
+keeps every page alive until the reports are written.
+
+PageRecord stores the same data in __slots__ and nested tuples, and splits
+link/image URLs into an interned origin ("https://host") plus the rest, so a
+page's fifty links to its own site share one origin string. It is a
+read-mostly Mapping: record["headings"] and record.get(...) rebuild the
+dict-shaped value on access, so the formatters work on records unchanged
+without keeping the dict form resident. to_dict()/from_dict() convert
+losslessly for JSON and the cache.
+
+Records read from a packed cache entry (serialization.unpack_page) keep
+their heavy sections undecoded until first access, so a report that never
+reads a page's links or tables never decodes them.
+"""
+
+import sys
+from collections.abc import Mapping
+
+# Scalar fields kept directly in slots; None means "key absent".
+_SCALARS = ("url", "title", "meta_description", "text", "error",
+            "final_url", "simhash", "duplicate_of")
+_STRUCTURED = ("headings", "lists", "tables", "images", "links")
+_KEY_ORDER = ("url", "title", "meta_description", "headings", "text", "lists",
+              "tables", "images", "links", "error", "final_url", "simhash", "duplicate_of")
+_MISSING = object()
+
+
+def _split_url(url: str) -> tuple[str, str]:
+    """("https://host", "/path?q") with the origin interned."""
+    i = url.find("/", url.find("://") + 3) if "://" in url else -1
+    if i < 0:
+        return sys.intern(url), ""
+    return sys.intern(url[:i]), url[i:]
+
+
+class PageRecord(Mapping):
+    __slots__ = _SCALARS + ("_headings", "_lists", "_tables", "_images", "_links", "_extra", "_lazy")
+
+    def __init__(self):
+        for name in _SCALARS:
+            setattr(self, name, None)
+        self._headings = self._lists = self._tables = self._images = self._links = None
+        self._extra = None  # any other keys (e.g. _cached, _robots_blocked)
+        self._lazy = None   # (decode, {key: undecoded buffer}) for packed cache entries
+
+    # ── Conversion ───────────────────────────────────────────────────────
+
+    @classmethod
+    def from_dict(cls, page: dict) -> "PageRecord":
+        if isinstance(page, PageRecord):
+            return page
+        rec = cls()
+        for key, value in page.items():
+            rec[key] = value
+        return rec
+
+    @classmethod
+    def from_sections(cls, fields: dict, sections: dict, decode) -> "PageRecord":
+        """Record from serialization.unpack_page() output; each section is
+        decoded with ``decode`` the first time its key is read."""
+        rec = cls.from_dict(fields)
+        if sections:
+            rec._lazy = (decode, dict(sections))
+        return rec
+
+    def _materialize(self, key: str) -> None:
+        decode, pending = self._lazy
+        value = decode(pending.pop(key))
+        if not pending:
+            self._lazy = None  # drop the reference to the file buffer
+        self[key] = value
+
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self}
+
+    # ── Mapping interface ────────────────────────────────────────────────
+
+    def __getitem__(self, key: str):
+        if self._lazy is not None and key in self._lazy[1]:
+            self._materialize(key)
+        if key in _SCALARS:
+            value = getattr(self, key)
+        elif key in _STRUCTURED:
+            packed = getattr(self, "_" + key)
+            value = None if packed is None else _UNPACK[key](packed)
+        else:
+            value = (self._extra or {}).get(key, _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value) -> None:
+        if self._lazy is not None and key in self._lazy[1]:
+            del self._lazy[1][key]
+            if not self._lazy[1]:
+                self._lazy = None
+        if key in _SCALARS:
+            setattr(self, key, value)
+        elif key == "headings":
+            self._headings = tuple((h["level"], h["text"]) for h in value)
+        elif key == "lists":
+            self._lists = tuple((sys.intern(lst["type"]), tuple(lst["items"])) for lst in value)
+        elif key == "tables":
+            self._tables = tuple(tuple(tuple(row) for row in table) for table in value)
+        elif key == "images":
+            self._images = tuple(_split_url(img["src"]) + (img.get("alt", ""),) for img in value)
+        elif key == "links":
+            self._links = tuple((ln["text"],) + _split_url(ln["url"]) for ln in value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def _present(self, key: str) -> bool:
+        if self._lazy is not None and key in self._lazy[1]:
+            return True
+        if key in _SCALARS:
+            return getattr(self, key) is not None
+        if key in _STRUCTURED:
+            return getattr(self, "_" + key) is not None
+        return bool(self._extra) and key in self._extra
+
+    def __contains__(self, key) -> bool:
+        return self._present(key)
+
+    def __iter__(self):
+        for key in _KEY_ORDER:
+            if self._present(key):
+                yield key
+        if self._extra:
+            yield from self._extra
+        if self._lazy is not None:
+            yield from (k for k in self._lazy[1] if k not in _KEY_ORDER)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def pop(self, key: str, default=_MISSING):
+        if self._present(key):
+            value = self[key]
+            if key in _SCALARS:
+                setattr(self, key, None)
+            elif key in _STRUCTURED:
+                setattr(self, "_" + key, None)
+            else:
+                del self._extra[key]
+            return value
+        if default is _MISSING:
+            raise KeyError(key)
+        return default
+
+    def __repr__(self) -> str:
+        return f"PageRecord({self.url!r})"
+
+
+_UNPACK = {
+    "headings": lambda packed: [{"level": lvl, "text": t} for lvl, t in packed],
+    "lists": lambda packed: [{"type": typ, "items": list(items)} for typ, items in packed],
+    "tables": lambda packed: [[list(row) for row in table] for table in packed],
+    "images": lambda packed: [{"src": o + rest, "alt": alt} for o, rest, alt in packed],
+    "links": lambda packed: [{"text": t, "url": o + rest} for t, o, rest in packed],
+}
+
+
+def compact_pages(pages: list[dict]) -> list[PageRecord]:
+    return [PageRecord.from_dict(p) for p in pages]
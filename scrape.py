@@ -5,14 +5,121 @@ Plethora CLI — search, scrape, report.
 Usage:
   python scrape.py "your search query" --level low|medium|high
   python scrape.py "python web frameworks" --level high --results 8 --subpages 3
+  python scrape.py --resume 20260101_120000_ab12cd
+  python scrape.py search-local "terms"     # search pages already scraped
+  python scrape.py "query" --queue tcp://127.0.0.1:7070 --shards 4  # coordinator
+  python scrape.py worker --queue tcp://127.0.0.1:7070 --shard 0    # one per shard
 """
 
 import argparse
+import os
 import sys
-from scraper import run
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from metrics import MetricsRegistry
+
+# The engine (and requests with it) is imported in main() after argument
+# parsing, so --help and usage errors return without paying for it.
+
+
+def _export_metrics(registry: "MetricsRegistry", args) -> None:
+    """Write/push collected metrics to every target requested on the command line."""
+    if args.metrics_file:
+        registry.write_prometheus(args.metrics_file)
+    if args.statsd:
+        host, _, port = args.statsd.rpartition(":")
+        try:
+            registry.push_statsd(host or "127.0.0.1", int(port))
+        except OSError as e:
+            print(f"⚠ StatsD push failed: {e}", file=sys.stderr)
+
+
+def search_local_main(argv: list[str]) -> None:
+    """`scrape.py search-local "terms"` — ranked hits from the local index."""
+    parser = argparse.ArgumentParser(
+        prog="scrape.py search-local",
+        description="Search pages you have already scraped (offline, local full-text index)",
+    )
+    parser.add_argument("terms", nargs="?", default="", help="Words that must all occur")
+    parser.add_argument("-n", "--limit", type=int, default=10, help="Max hits (default: 10)")
+    parser.add_argument("--json", action="store_true", help="Print hits as JSON")
+    parser.add_argument(
+        "--rebuild", action="store_true",
+        help="First index every page in the URL cache (e.g. pages cached before the index existed)",
+    )
+    args = parser.parse_args(argv)
+    if not args.terms and not args.rebuild:
+        parser.error("search terms are required unless --rebuild is given")
+
+    import scraper
+
+    if args.rebuild:
+        print(f"[+] Indexed {scraper.rebuild_local_index()} cached page(s)", file=sys.stderr)
+    if not args.terms:
+        return
+    hits = scraper.search_local(args.terms, args.limit)
+    if args.json:
+        import json
+        print(json.dumps(hits, indent=2, ensure_ascii=False))
+        return
+    if not hits:
+        print("No matching pages in the local index.")
+        return
+    from datetime import datetime
+    for i, hit in enumerate(hits, 1):
+        scraped = datetime.fromtimestamp(hit["indexed_at"]).strftime("%Y-%m-%d %H:%M")
+        print(f"{i:>2}. {hit['title'] or hit['url']}")
+        print(f"    {hit['url']}  (scraped {scraped})")
+        print(f"    {hit['snippet']}")
+
+
+def worker_main(argv: list[str]) -> None:
+    """`scrape.py worker` — scrape one shard's pages for a distributed run."""
+    parser = argparse.ArgumentParser(
+        prog="scrape.py worker",
+        description="Serve one shard of a distributed crawl (see --queue/--shards)",
+    )
+    parser.add_argument("--queue", required=True,
+                        help="Queue the coordinator uses: sqlite:///path/queue.db or tcp://host:port")
+    parser.add_argument("--shard", type=int, required=True, help="Shard this worker owns (0-based)")
+    parser.add_argument("--worker-id", help="Name in shard leases (default: hostname-pid)")
+    parser.add_argument("-w", "--workers", type=int, default=4,
+                        help="Concurrent scraping threads in this worker (default: 4)")
+    parser.add_argument("--idle-exit", type=float, metavar="SECS",
+                        help="Exit after this long without work (default: run until interrupted)")
+    parser.add_argument("--cache-format", choices=["binary", "json"], default="binary",
+                        help="URL cache entry format (default: binary)")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress per-task output")
+    args = parser.parse_args(argv)
+
+    import scraper
+    from distributed import open_queue, run_worker
+
+    scraper.CACHE_FORMAT = args.cache_format
+    queue = open_queue(args.queue)
+    log = (lambda *a, **kw: None) if args.quiet else print
+    try:
+        done = run_worker(queue, args.shard, worker_id=args.worker_id,
+                          idle_exit=args.idle_exit, workers=args.workers, log=log)
+        log(f"[+] Idle; {done} task(s) completed")
+    except KeyboardInterrupt:
+        print("\n⚠ Worker stopped.")
+    except Exception as e:
+        print(f"\n❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        queue.close()
 
 
 def main():
+    if sys.argv[1:2] == ["search-local"]:
+        search_local_main(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["worker"]:
+        worker_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Plethora — scrape the web and generate reports",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -35,9 +142,12 @@ Examples:
   plethora "machine learning tutorials" --level medium --results 50
   plethora "climate change data" --level high --results 10 --subpages 3
   plethora "AI research" --level high --format all --workers 8 --results 100
+  plethora search-local "transformer attention"
+  plethora "rust async" --level high --queue sqlite:///tmp/q.db --shards 2
+  plethora worker --queue sqlite:///tmp/q.db --shard 0
         """,
     )
-    parser.add_argument("query", help="Search query string")
+    parser.add_argument("query", nargs="?", help="Search query string (omit with --resume)")
     parser.add_argument(
         "-l", "--level",
         choices=["low", "medium", "high"],
@@ -85,11 +195,125 @@ Examples:
         type=int, default=3600,
         help="Cache TTL in seconds (default: 3600)",
     )
+    parser.add_argument(
+        "--cache-format",
+        choices=["binary", "json"],
+        default="binary",
+        help="URL cache entry format: packed, lazily decoded binary or plain JSON (default: binary)",
+    )
+    parser.add_argument(
+        "--search-cache-ttl",
+        type=int, default=6 * 3600,
+        help="Search result cache TTL in seconds (default: 21600)",
+    )
+    parser.add_argument(
+        "--search-provider",
+        choices=["ddg", "fixture"],
+        default="ddg",
+        help="Search backend: live DuckDuckGo or recorded SERP fixtures (default: ddg)",
+    )
+    parser.add_argument(
+        "--fixture-dir",
+        default="fixtures",
+        help="Directory of recorded SERPs for --search-provider fixture (default: fixtures/)",
+    )
+    parser.add_argument(
+        "--record-fixtures",
+        action="store_true",
+        help="With --search-provider fixture, fetch missing SERPs from DuckDuckGo and save them",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print a per-stage timing summary and save a Chrome trace next to the report",
+    )
+    parser.add_argument(
+        "--local-first",
+        action="store_true",
+        help="Fill results from pages already scraped (local index) before searching the web",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float, metavar="SECS",
+        help="Finish within SECS: drop sub-pages first, then write a partial report "
+             "marking what was skipped (resumable with --resume)",
+    )
+    parser.add_argument(
+        "--queue",
+        metavar="SPEC",
+        help="Distributed crawl: hand page scraping to shard workers through "
+             "sqlite:///path/queue.db or tcp://host:port (served by this process; "
+             "off loopback, set PLETHORA_QUEUE_TOKEN here and on every worker)",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int, default=1,
+        help="Number of shard workers for --queue; hosts are split among them by hash (default: 1)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from its journal (query and options are taken from it)",
+    )
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Don't keep a run journal (the run can't be resumed)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write Prometheus text-format metrics here after the run (e.g. for node_exporter)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int, metavar="PORT",
+        help="Serve Prometheus metrics on http://0.0.0.0:PORT/metrics while running",
+    )
+    parser.add_argument(
+        "--statsd",
+        metavar="HOST:PORT",
+        help="Push StatsD-style metrics over UDP after the run",
+    )
 
     args = parser.parse_args()
+    if not args.query and not args.resume:
+        parser.error("a search query is required unless --resume is given")
+    if args.shards < 1:
+        parser.error("--shards must be at least 1")
+    if args.deadline is not None and args.deadline <= 0:
+        parser.error("--deadline must be positive")
     args.results = min(max(args.results, 1), 100)  # Clamp 1–100
 
+    import scraper
+    from scraper import run, get_search_provider, DuckDuckGoProvider
+    from journal import new_run_id
+    from profiling import Profiler
+    from metrics import MetricsRegistry
+
+    run_id = args.resume or (None if args.no_journal else new_run_id())
+    scraper.CACHE_FORMAT = args.cache_format
+
+    if args.search_provider == "fixture":
+        provider = get_search_provider(
+            "fixture", fixture_dir=args.fixture_dir,
+            record_from=DuckDuckGoProvider() if args.record_fixtures else None)
+    else:
+        provider = get_search_provider(args.search_provider)
+    profiler = Profiler() if args.profile else None
+    registry = None
+    if args.metrics_file or args.metrics_port or args.statsd:
+        registry = MetricsRegistry()
+        if args.metrics_port:
+            registry.serve(args.metrics_port)
+
+    coordinator = None
     try:
+        if args.queue:
+            from distributed import Coordinator, open_queue
+            coordinator = Coordinator(open_queue(args.queue, serve=True), args.shards)
+            if not args.quiet:
+                print(f"[*] Distributed: {args.shards} shard(s) via {args.queue}")
         paths = run(
             query=args.query,
             level=args.level,
@@ -101,11 +325,28 @@ Examples:
             cache_ttl=args.cache_ttl,
             quiet=args.quiet,
             out_format=args.format,
+            search_provider=provider,
+            search_cache_ttl=args.search_cache_ttl,
+            profiler=profiler,
+            metrics=registry,
+            run_id=run_id,
+            resume=args.resume,
+            journal=not args.no_journal,
+            local_first=args.local_first,
+            coordinator=coordinator,
+            deadline=args.deadline,
         )
         print(f"\n✅ Done! {len(paths)} report(s) saved:")
         for p in paths:
             print(f"   → {p}")
 
+        if profiler:
+            trace_base = os.path.splitext(paths[0])[0] if paths else os.path.join(args.output, "run")
+            trace_path = profiler.dump_chrome_trace(f"{trace_base}.trace.json")
+            print("\n⏱  Stage timings:")
+            print(profiler.format_summary())
+            print(f"   Trace (chrome://tracing / ui.perfetto.dev): {trace_path}")
+
         # Pick the primary report to offer for viewing (prefer txt > md > html > json)
         viewable = next((p for p in paths if p.endswith(".txt")),
                         next((p for p in paths if p.endswith(".md")),
@@ -117,10 +358,19 @@ Examples:
                 subprocess.run(["less", "-R", viewable])
     except KeyboardInterrupt:
         print("\n⚠ Interrupted.")
+        if run_id:
+            print(f"   Resume with: python scrape.py --resume {run_id}")
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ Error: {e}", file=sys.stderr)
+        if run_id and not isinstance(e, (FileNotFoundError, FileExistsError)):
+            print(f"   Resume with: python scrape.py --resume {run_id}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if coordinator:
+            coordinator.close()
+        if registry:
+            _export_metrics(registry, args)
 
 
 if __name__ == "__main__":
@@ -5,20 +5,35 @@ Generates LOW / MEDIUM / HIGH detail reports.
 Supports up to 100 results with DuckDuckGo pagination.
 """
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin, quote_plus, parse_qs, unquote
-from urllib.robotparser import RobotFileParser
-from concurrent.futures import ThreadPoolExecutor, as_completed
+# requests/urllib3, bs4, concurrent.futures and urllib.robotparser are
+# imported where they are first needed: together they are most of this
+# module's import time, and `--help` or a --level low run never touches some
+# of them. Keep heavy imports out of module level (see benchmarks/bench_startup.py).
+from html.parser import HTMLParser
+from urllib.parse import (urlparse, urlunparse, urljoin, quote_plus, parse_qs,
+                          parse_qsl, unquote, urlencode)
 import threading
+import socket
+import atexit
+import contextvars
+import functools
 import hashlib
+import itertools
+import importlib.util
 import time
 import json
 import re
 import os
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from typing import Iterator
+from profiling import NULL_PROFILER, Profiler
+from metrics import NULL_METRICS, MetricsRegistry
+from journal import NULL_JOURNAL, RunJournal
+from fingerprint import FingerprintIndex, page_fingerprint
+from records import PageRecord, compact_pages
+from charset import decode_html
+import serialization
 
 HEADERS = {
     "User-Agent": (
@@ -31,78 +46,745 @@ HEADERS = {
 }
 
 TIMEOUT = 15
+POOL_HOSTS = 100  # hosts whose keep-alive connections are kept (requests' default: 10)
+
+
+# ── Profiling & Metrics Hooks ────────────────────────────────────────────────
+
+# The profiler, metrics registry and deadline budget of the run() a thread
+# is working for, as (profiler, metrics, budget); None outside a run. Each
+# run() sets its own and the threads it starts carry it over (_copy_scope),
+# so concurrent runs don't see each other's, and work a run abandoned at its
+# deadline still obeys that deadline after run() has returned.
+_run_scope: contextvars.ContextVar[tuple | None] = contextvars.ContextVar(
+    "plethora_run_scope", default=None)
+
+
+def _profiler() -> Profiler:
+    scope = _run_scope.get()
+    return NULL_PROFILER if scope is None else scope[0]
+
+
+def _metrics() -> MetricsRegistry:
+    scope = _run_scope.get()
+    return NULL_METRICS if scope is None else scope[1]
+
+
+def _budget() -> "_Budget":
+    scope = _run_scope.get()
+    return NO_BUDGET if scope is None else scope[2]
+
+
+def _copy_scope(fn):
+    """``fn`` bound to the calling thread's run scope, to run in another thread."""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+class _RunPool:
+    """Thread pool for one stage of a run. Each task runs in the run scope of
+    the thread that submitted it. The threads are daemons: fetches a run gave
+    up on at its deadline must not hold the interpreter open at exit, as
+    ThreadPoolExecutor's workers (joined at exit) would."""
+
+    def __init__(self, max_workers: int):
+        import queue
+
+        self._work = queue.SimpleQueue()
+        self._max_workers = max_workers
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        from concurrent.futures import Future
+
+        future = Future()
+        self._work.put((future, _copy_scope(fn), args, kwargs))
+        with self._lock:
+            if len(self._threads) < self._max_workers:
+                thread = threading.Thread(target=self._loop, daemon=True,
+                                          name=f"plethora-worker-{len(self._threads)}")
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def _loop(self):
+        while True:
+            item = self._work.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if not future.set_running_or_notify_cancel():
+                continue  # cancelled while queued
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def shutdown(self, wait: bool = True, cancel_futures: bool = False) -> None:
+        import queue
+
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._work.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        with self._lock:
+            threads = list(self._threads)
+        for _ in threads:
+            self._work.put(None)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+
+def _record_fetch(url: str, start: float, resp, error: Exception | None) -> None:
+    """Count one page fetch — outcome, bytes, retries, latency — by domain."""
+    m = _metrics()
+    if not m.enabled:
+        return
+    import requests  # already loaded by the fetch being recorded
+
+    domain = urlparse(url).netloc
+    retries = getattr(getattr(getattr(resp, "raw", None), "retries", None), "history", ())
+    if error is None:
+        status = str(resp.status_code)
+        m.counter("plethora_bytes_downloaded_total", "Response body bytes downloaded").inc(
+            len(resp.content), domain=domain)
+    elif isinstance(error, requests.HTTPError) and error.response is not None:
+        status = str(error.response.status_code)
+    else:
+        status = "error"
+    if isinstance(error, requests.exceptions.RetryError):
+        retries = _session().get_adapter(url).max_retries.total or 0
+    else:
+        retries = len(retries)
+    m.counter("plethora_fetches_total", "Page fetches by domain and HTTP status").inc(
+        domain=domain, status=status)
+    if retries:
+        m.counter("plethora_retries_total", "HTTP retries performed by urllib3").inc(
+            retries, domain=domain)
+    if error is not None:
+        m.counter("plethora_errors_total", "Failed page fetches by domain and error kind").inc(
+            domain=domain, kind=status if status != "error" else type(error).__name__)
+    m.histogram("plethora_fetch_duration_seconds", "Request + download time per page").observe(
+        time.perf_counter() - start)
 
 
 # ── HTTP Session with Retries ────────────────────────────────────────────────
 
-def _make_session() -> requests.Session:
+def _make_session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+    from urllib3.exceptions import (ConnectTimeoutError, MaxRetryError, NameResolutionError,
+                                    NewConnectionError, ResponseError)
+    from urllib3.util.connection import allowed_gai_family, create_connection
+    from urllib3.util.retry import Retry
+
+    # Connections resolve host names through the shared DNS cache (_resolve),
+    # then try each address in turn as urllib3 would.
+    class _CachedDNSConnection:
+        def _new_conn(self):
+            try:
+                addresses = _resolve(self._dns_host.strip("[]"), self.port, allowed_gai_family())
+            except socket.gaierror as e:
+                raise NameResolutionError(self.host, self, e) from e
+            err = NewConnectionError(self, "Failed to establish a new connection: no addresses")
+            for *_, sockaddr in addresses:
+                host = sockaddr[0]
+                if len(sockaddr) == 4 and sockaddr[3]:  # scoped (link-local) IPv6
+                    host = f"{host}%{sockaddr[3]}"
+                try:
+                    return create_connection((host, sockaddr[1]), self.timeout,
+                                             source_address=self.source_address,
+                                             socket_options=self.socket_options)
+                except TimeoutError:
+                    err = ConnectTimeoutError(self, f"Connection to {self.host} timed out. "
+                                                    f"(connect timeout={self.timeout})")
+                except OSError as e:
+                    err = NewConnectionError(self, f"Failed to establish a new connection: {e}")
+            raise err
+
+    # ...and report TCP connect + TLS handshake time (DNS included) to the
+    # active profiler. Reused keep-alive connections don't connect, so they add nothing.
+    class _TimedHTTPConnection(_CachedDNSConnection, HTTPConnection):
+        def connect(self):
+            with _profiler().span("connect"):
+                super().connect()
+
+    class _TimedHTTPSConnection(_CachedDNSConnection, HTTPSConnection):
+        def connect(self):
+            with _profiler().span("connect"):
+                super().connect()
+
+    # robots.txt gets a single attempt: its status decides what is allowed
+    # (see _read_robots), so the page retry policy doesn't apply to it.
+    class _RobotsOnce:
+        def urlopen(self, method, url, *args, **kwargs):
+            if urlparse(url).path == "/robots.txt":
+                kwargs["retries"] = Retry(0, read=False)
+            return super().urlopen(method, url, *args, **kwargs)
+
+    class _TimedHTTPConnectionPool(_RobotsOnce, HTTPConnectionPool):
+        ConnectionCls = _TimedHTTPConnection
+
+    class _TimedHTTPSConnectionPool(_RobotsOnce, HTTPSConnectionPool):
+        ConnectionCls = _TimedHTTPSConnection
+
+    class _TimedHTTPAdapter(HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {
+                "http": _TimedHTTPConnectionPool,
+                "https": _TimedHTTPSConnectionPool,
+            }
+
+    # In a deadline-bounded run, give up instead of retrying when the backoff
+    # sleep alone would reach the deadline.
+    class _DeadlineRetry(Retry):
+        def increment(self, method=None, url=None, response=None, error=None,
+                      _pool=None, _stacktrace=None):
+            retry = super().increment(method, url, response, error, _pool, _stacktrace)
+            budget = _budget()
+            if budget.bounded and retry.get_backoff_time() >= budget.left():
+                raise MaxRetryError(_pool, url, error or ResponseError("run deadline reached"))
+            return retry
+
     session = requests.Session()
     session.headers.update(HEADERS)
-    retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
+    retry = _DeadlineRetry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = _TimedHTTPAdapter(max_retries=retry, pool_connections=POOL_HOSTS)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
     return session
 
-SESSION = _make_session()
+
+_session_lock = threading.Lock()
+
+
+def _session():
+    """The shared session, created (and requests imported) on first use."""
+    global SESSION
+    try:
+        return SESSION
+    except NameError:
+        with _session_lock:
+            if "SESSION" not in globals():
+                SESSION = _make_session()
+        return SESSION
+
+
+def __getattr__(name: str):
+    # `scraper.SESSION` from outside works before the first fetch, too
+    if name == "SESSION":
+        return _session()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ── DNS Cache ────────────────────────────────────────────────────────────────
+
+DNS_TTL = 300  # seconds a resolved host is reused by every thread; 0 disables
+
+
+class _KeyedLocks:
+    """One lock per key, created on first use."""
+
+    def __init__(self):
+        self._locks: dict = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, key) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+
+_dns_cache: dict[tuple, tuple[float, list]] = {}
+_dns_locks = _KeyedLocks()
+
+
+def _resolve(host: str, port: int, family: int = socket.AF_UNSPEC) -> list[tuple]:
+    """getaddrinfo() results for a TCP connection to (host, port), cached for
+    DNS_TTL seconds. Concurrent lookups of one host wait for the first."""
+    key = (host, port, family)
+    lookups = _metrics().counter("plethora_dns_lookups_total", "Host name lookups by cache result")
+    entry = _dns_cache.get(key)
+    if entry is None or entry[0] <= time.monotonic():
+        with _dns_locks(key):
+            entry = _dns_cache.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                with _profiler().span("dns"):
+                    addresses = socket.getaddrinfo(host, port, family, socket.SOCK_STREAM)
+                if DNS_TTL > 0:
+                    _dns_cache[key] = (time.monotonic() + DNS_TTL, addresses)
+                lookups.inc(result="miss")
+                return addresses
+    lookups.inc(result="hit")
+    return entry[1]
 
 
 # ── robots.txt Cache ─────────────────────────────────────────────────────────
 
-_robots_cache: dict[str, RobotFileParser] = {}
-_robots_lock = threading.Lock()
+_robots_cache: dict[str, "RobotFileParser"] = {}
+_robots_locks = _KeyedLocks()
+
+
+def _read_robots(robots_url: str):
+    """Fetch and parse robots.txt, or None on a network error. It goes through
+    the shared session, so its connection stays pooled for the host's pages."""
+    from urllib.robotparser import RobotFileParser
+    rp = RobotFileParser(robots_url)
+    try:
+        resp = _session().get(robots_url, timeout=_budget().timeout())
+        if resp.status_code in (401, 403):
+            rp.disallow_all = True
+        elif 400 <= resp.status_code < 500:
+            rp.allow_all = True
+        elif resp.status_code < 300:
+            rp.parse(resp.content.decode("utf-8").splitlines())
+        # a 5xx leaves it unread, which disallows all (as RobotFileParser.read() does)
+    except Exception:
+        return None
+    return rp
 
 
 def _is_allowed(url: str) -> bool:
     """Check robots.txt for the given URL. Returns True if allowed or on error."""
     parsed = urlparse(url)
     robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-    with _robots_lock:
-        if robots_url not in _robots_cache:
-            rp = RobotFileParser()
-            rp.set_url(robots_url)
-            try:
-                rp.read()
-            except Exception:
-                return True  # allow on error
-            _robots_cache[robots_url] = rp
-        rp = _robots_cache[robots_url]
+    rp = _robots_cache.get(robots_url)
+    if rp is None:
+        # One fetch per host; other hosts' robots.txt are fetched in parallel
+        wait_start = time.perf_counter()
+        with _robots_locks(robots_url):
+            _profiler().add("robots_lock_wait", wait_start, time.perf_counter())
+            rp = _robots_cache.get(robots_url)
+            if rp is None:
+                rp = _read_robots(robots_url)
+                if rp is None:
+                    return True  # allow on error
+                _robots_cache[robots_url] = rp
     return rp.can_fetch(HEADERS["User-Agent"], url)
 
 
+# ── Connection Pre-warming ───────────────────────────────────────────────────
+
+PREWARM = True  # warm up the hosts on the first results page while search continues
+
+
+def _prewarm_host(url: str) -> None:
+    with _profiler().span("prewarm", url):
+        try:
+            _is_allowed(url)
+        except Exception:
+            return
+    _metrics().counter("plethora_prewarmed_hosts_total",
+                       "Hosts resolved and connected to ahead of scraping").inc()
+
+
+def prewarm(urls: list[str]) -> list[threading.Thread]:
+    """Warm up every distinct host in ``urls`` in the background: resolve it
+    (into the DNS cache), fetch its robots.txt and leave that connection —
+    TCP and TLS already set up — in the session's pool. Scraping those hosts
+    then skips those round trips. Returns the (daemon) threads doing it."""
+    by_origin = {}
+    for url in urls:
+        parsed = urlparse(url)
+        if parsed.scheme in ("http", "https"):
+            by_origin.setdefault((parsed.scheme, parsed.netloc), url)
+    threads = []
+    for (scheme, netloc), url in by_origin.items():
+        if f"{scheme}://{netloc}/robots.txt" in _robots_cache:
+            continue  # already contacted by this process
+        thread = threading.Thread(target=_copy_scope(_prewarm_host), args=(url,),
+                                  name=f"prewarm-{netloc}", daemon=True)
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+# ── URL Canonicalization ─────────────────────────────────────────────────────
+
+# Query parameters that only track the visitor and never change the content
+_TRACKING_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref_src", "ref_url", "spm", "oly_anon_id", "oly_enc_id", "vero_id",
+}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def canonical_url(url: str) -> str:
+    """Identity form of a URL for caching and dedup — not for fetching.
+
+    http/https collapse to https, host is lowercased and default ports
+    dropped, fragments and tracking parameters (utm_*, gclid, fbclid, ...)
+    are removed, remaining query parameters are sorted, and trailing slashes
+    on non-root paths are stripped.
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return url
+    scheme = parsed.scheme.lower()
+    if scheme not in _DEFAULT_PORTS:
+        return url
+    host = (parsed.hostname or "").lower().rstrip(".")
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    netloc = host if port in (None, _DEFAULT_PORTS[scheme]) else f"{host}:{port}"
+    path = parsed.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    ))
+    return urlunparse(("https", netloc, path, parsed.params, query, ""))
+
+
 # ── URL Cache ────────────────────────────────────────────────────────────────
 
 CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+# "binary": packed entries (<key>.bin, see serialization.py) whose heavy
+# fields are decoded only when read; "json": plain, human-readable <key>.json.
+# Either format is read back regardless of this setting.
+CACHE_FORMAT = "binary"
 
 
 def _cache_key(url: str) -> str:
-    return hashlib.sha256(url.encode()).hexdigest()
+    return hashlib.sha256(canonical_url(url).encode()).hexdigest()
 
 
-def _cache_get(url: str, ttl_seconds: int = 3600) -> dict | None:
-    path = os.path.join(CACHE_DIR, f"{_cache_key(url)}.json")
+def _is_fresh(path: str, ttl_seconds: int | None) -> bool:
+    if ttl_seconds is None:
+        return True
+    mtime = datetime.fromtimestamp(os.path.getmtime(path))
+    return datetime.now() - mtime <= timedelta(seconds=ttl_seconds)
+
+
+def _read_cached_json(path: str, ttl_seconds: int | None):
+    """Cached JSON at ``path``, or None if missing, unreadable or older than
+    ``ttl_seconds`` (None: any age)."""
     if not os.path.exists(path):
         return None
     try:
-        mtime = datetime.fromtimestamp(os.path.getmtime(path))
-        if datetime.now() - mtime > timedelta(seconds=ttl_seconds):
+        if not _is_fresh(path, ttl_seconds):
             return None
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return serialization.loads(f.read())
     except Exception:
         return None
 
 
-def _cache_put(url: str, data: dict) -> None:
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    path = os.path.join(CACHE_DIR, f"{_cache_key(url)}.json")
+_made_dirs: set[str] = set()
+
+
+def _atomic_write(path: str, blob: bytes) -> None:
+    """Write ``blob`` to a temp file and rename it over ``path``, so a reader
+    (or a crash) never sees a partially written entry."""
+    directory = os.path.dirname(path)
+    if directory not in _made_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _made_dirs.add(directory)
+    tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    for attempt in range(2):
+        try:
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+            return
+        except FileNotFoundError:
+            # the directory was removed while we ran (e.g. a cache cleanup):
+            # recreate it once instead of failing every later write
+            if attempt:
+                break
+            os.makedirs(directory, exist_ok=True)
+        except Exception:
+            break
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, default=str)
+        os.remove(tmp)
+    except OSError:
+        pass
+
+
+def _write_cached_json(path: str, data) -> None:
+    try:
+        _atomic_write(path, serialization.dumps(data))
     except Exception:
         pass
 
 
+def _read_cache_entry(key: str, ttl_seconds: int | None):
+    """Entry stored under ``key``: a lazily decoded PageRecord for packed
+    pages, a dict for JSON entries and aliases; None if missing or stale."""
+    path = os.path.join(CACHE_DIR, f"{key}.bin")
+    if not os.path.exists(path):
+        return _read_cached_json(os.path.join(CACHE_DIR, f"{key}.json"), ttl_seconds)
+    try:
+        if not _is_fresh(path, ttl_seconds):
+            return None
+        with open(path, "rb") as f:
+            fields, sections, decode = serialization.unpack_page(f.read())
+    except Exception:
+        return None
+    if "_alias" in fields:
+        return fields
+    return PageRecord.from_sections(fields, sections, decode)
+
+
+def _write_cache_entry(key: str, data) -> None:
+    binary = CACHE_FORMAT == "binary"
+    path = os.path.join(CACHE_DIR, f"{key}.{'bin' if binary else 'json'}")
+    other = os.path.join(CACHE_DIR, f"{key}.{'json' if binary else 'bin'}")
+    if os.path.exists(other):  # the .bin would shadow a newer .json on read
+        try:
+            os.remove(other)
+        except OSError:
+            pass
+    if not binary:
+        _write_cached_json(path, data)
+        return
+    try:
+        _atomic_write(path, serialization.pack_page(data))
+    except Exception:
+        pass
+
+
+# ── Write-behind Cache Writer ────────────────────────────────────────────────
+# Cache entries (and local index updates) are written by a background thread,
+# so scrape workers only hand data over instead of waiting on disk or SQLite.
+# Entries waiting to be written are served from memory by _cache_get; the
+# queue is flushed at the end of every run (also when it is interrupted) and
+# at interpreter exit.
+
+CACHE_WRITE_BEHIND = True  # False: write synchronously in the calling thread
+_CACHE_WRITE_BATCH = 64
+
+
+class _CacheWriter:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._pending: dict[str, dict] = {}  # cache key → newest entry not yet on disk
+        self._jobs: list[tuple] = []         # (fn, args) side writes, e.g. index updates
+        self._active = False
+        self._thread = None
+        self._metrics = NULL_METRICS  # registry of the run that queued the latest write
+
+    def put(self, key: str, data: dict) -> None:
+        with self._cond:
+            self._pending[key] = data
+            self._wake()
+
+    def submit(self, fn, *args) -> None:
+        with self._cond:
+            self._jobs.append((fn, args))
+            self._wake()
+
+    def get(self, key: str):
+        """Entry queued under ``key`` (a copy), or None."""
+        with self._cond:
+            data = self._pending.get(key)
+        return dict(data) if data is not None else None
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._pending) + len(self._jobs)
+
+    def flush(self) -> None:
+        """Block until everything queued so far is written."""
+        with self._cond:
+            while self._pending or self._jobs or self._active:
+                self._cond.wait()
+
+    def _wake(self):
+        # caller holds self._cond
+        self._metrics = _metrics()
+        self._metrics.gauge("plethora_cache_write_queue_depth",
+                            "Cache entries and index updates waiting to be written").set(
+            len(self._pending) + len(self._jobs))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="cache-writer", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._jobs:
+                    self._cond.wait()
+                batch = list(itertools.islice(self._pending.items(), _CACHE_WRITE_BATCH))
+                jobs, self._jobs = self._jobs, []
+                self._active = True
+            for key, data in batch:
+                _write_cache_entry(key, data)
+            for fn, args in jobs:
+                try:
+                    fn(*args)
+                except Exception:
+                    pass
+            with self._cond:
+                for key, data in batch:
+                    if self._pending.get(key) is data:  # not replaced while writing
+                        del self._pending[key]
+                self._active = False
+                self._metrics.gauge("plethora_cache_write_queue_depth",
+                                    "Cache entries and index updates waiting to be written").set(
+                    len(self._pending) + len(self._jobs))
+                self._cond.notify_all()
+
+
+_cache_writer = _CacheWriter()
+atexit.register(_cache_writer.flush)
+
+
+def cache_queue_depth() -> int:
+    """Cache entries and index updates still waiting to be written."""
+    return _cache_writer.depth()
+
+
+def flush_cache() -> None:
+    """Wait until every queued cache entry and index update is on disk."""
+    _cache_writer.flush()
+
+
+def _cache_lookup(key: str, ttl_seconds: int | None):
+    data = _cache_writer.get(key)
+    return data if data is not None else _read_cache_entry(key, ttl_seconds)
+
+
+def _cache_get(url: str, ttl_seconds: int | None = 3600):
+    data = _cache_lookup(_cache_key(url), ttl_seconds)
+    if data and "_alias" in data:  # reached through a redirect — follow to the final URL
+        data = _cache_lookup(_cache_key(data["_alias"]), ttl_seconds)
+    return data
+
+
+def _cache_has(url: str, ttl_seconds: int | None) -> bool:
+    """Whether a fresh entry for ``url`` exists, judged without reading it."""
+    key = _cache_key(url)
+    if _cache_writer.get(key) is not None:
+        return True
+    for ext in ("bin", "json"):
+        path = os.path.join(CACHE_DIR, f"{key}.{ext}")
+        try:
+            return _is_fresh(path, ttl_seconds)
+        except OSError:  # missing
+            continue
+    return False
+
+
+def _cache_put(url: str, data: dict, aliases: list[str] = ()) -> None:
+    """Cache ``data`` under ``url``, plus an alias entry for every URL in
+    ``aliases`` (e.g. a redirect chain) that canonicalizes differently."""
+    write = _cache_writer.put if CACHE_WRITE_BEHIND else _write_cache_entry
+    write(_cache_key(url), dict(data))
+    target = canonical_url(url)
+    for alias in {canonical_url(a) for a in aliases} - {target}:
+        write(_cache_key(alias), {"_alias": target})
+
+
+# ── Local Full-text Index ────────────────────────────────────────────────────
+
+INDEX_ENABLED = True
+INDEX_PATH = None  # default: <CACHE_DIR>/index.sqlite3
+
+_local_index = None
+_local_index_lock = threading.Lock()
+
+
+def _get_local_index():
+    """The shared LocalIndex, opened on first use; None if indexing is off or
+    the index can't be opened (e.g. SQLite built without FTS5)."""
+    global _local_index
+    if not INDEX_ENABLED:
+        return None
+    path = INDEX_PATH or os.path.join(CACHE_DIR, "index.sqlite3")
+    with _local_index_lock:
+        # reopen if the file was deleted under us (a cleared cache directory)
+        if _local_index is None or _local_index.path != path or not os.path.exists(path):
+            from local_index import LocalIndex
+            if _local_index is not None:
+                _local_index.close()
+                _local_index = None
+            try:
+                _local_index = LocalIndex(path)
+            except Exception:
+                return None
+        return _local_index
+
+
+def _index_page(url: str, page: dict) -> None:
+    index = _get_local_index()
+    if index is None:
+        return
+    if CACHE_WRITE_BEHIND:
+        _cache_writer.submit(index.add, page, canonical_url(url))
+        return
+    try:
+        index.add(page, canonical_url(url))
+    except Exception:
+        pass  # the index is a convenience; never fail a scrape over it
+
+
+def search_local(terms: str, limit: int = 10, mark: tuple[str, str] = ("[", "]")) -> list[dict]:
+    """Ranked hits for ``terms`` among already-scraped pages:
+    {url, title, snippet, score, indexed_at}. No network access."""
+    index = _get_local_index()
+    if index is None:
+        return []
+    _cache_writer.flush()  # include pages whose index update is still queued
+    return index.search(terms, limit, mark)
+
+
+def rebuild_local_index() -> int:
+    """Index every page currently in the URL cache (e.g. pages cached before
+    the index existed). Returns the number of pages indexed."""
+    index = _get_local_index()
+    if index is None or not os.path.isdir(CACHE_DIR):
+        return 0
+    _cache_writer.flush()
+    count = 0
+    for name in os.listdir(CACHE_DIR):
+        key, ext = os.path.splitext(name)
+        if ext not in (".bin", ".json"):
+            continue
+        page = _read_cache_entry(key, None)
+        if page is None or "url" not in page or "_alias" in page:
+            continue
+        if index.add(page, canonical_url(page.get("final_url") or page["url"])):
+            count += 1
+    return count
+
+
+# ── Search Result Cache ──────────────────────────────────────────────────────
+
+SEARCH_CACHE_DIR = os.path.join(CACHE_DIR, "search")
+SEARCH_CACHE_TTL = 6 * 3600  # SERPs change slowly; queries repeat across daily jobs
+SEARCH_LOOKAHEAD = 2  # result pages requested ahead of the one being consumed
+
+
+def _search_cache_key(namespace: str, query: str, page_num: int) -> str:
+    return hashlib.sha256(f"{namespace}\0{query}\0{page_num}".encode()).hexdigest()
+
+
+def _search_cache_get(namespace: str, query: str, page_num: int,
+                      ttl_seconds: int = SEARCH_CACHE_TTL) -> list[dict] | None:
+    path = os.path.join(SEARCH_CACHE_DIR, f"{_search_cache_key(namespace, query, page_num)}.json")
+    return _read_cached_json(path, ttl_seconds)
+
+
+def _search_cache_put(namespace: str, query: str, page_num: int, results: list[dict]) -> None:
+    path = os.path.join(SEARCH_CACHE_DIR, f"{_search_cache_key(namespace, query, page_num)}.json")
+    _write_cached_json(path, results)
+
+
 # ── Per-domain Rate Limiting ─────────────────────────────────────────────────
 
 _domain_last_hit: dict[str, float] = {}
@@ -139,18 +821,120 @@ def clean_text(text: str) -> str:
     return text.strip()
 
 
-# ── DuckDuckGo Search with Pagination ────────────────────────────────────────
+# ── Search Providers ─────────────────────────────────────────────────────────
 
-def _parse_ddg_page(html: str, seen_urls: set) -> list[dict]:
-    """Parse a single DuckDuckGo HTML results page."""
-    soup = BeautifulSoup(html, "html.parser")
+class SearchProvider:
+    """A search backend. Subclasses return the parsed results for one SERP page.
+
+    ``fetch_page`` returns a list of {title, url, snippet} in rank order and may
+    raise on network/parse errors — callers treat that as an empty page.
+    """
+
+    name = "base"
+    page_size = 20   # results per page
+    max_pages = 5
+    cacheable = True  # whether pages go through the search result cache
+
+    @property
+    def cache_namespace(self) -> str:
+        """Search cache entries are shared by providers with the same namespace;
+        providers with a configurable endpoint include it."""
+        return self.name
+
+    def fetch_page(self, query: str, page_num: int) -> list[dict]:
+        raise NotImplementedError
+
+
+_VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+              "link", "meta", "param", "source", "track", "wbr"}
+
+
+class _DDGResultParser(HTMLParser):
+    """Streaming extractor for DuckDuckGo HTML result blocks.
+
+    Matches what ``.result`` / ``.result__title a, .result__a`` /
+    ``.result__snippet`` select with BeautifulSoup, but on the stdlib parser,
+    so search (and a whole --level low run) never imports bs4.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.results: list[dict] = []   # {href, title, snippet} per result block
+        self._stack: list[tuple[str, str | None]] = []  # (tag, role) per open element
+        self._current: dict | None = None
+        self._in_title = False
+        self._text: list[str] | None = None  # stripped text nodes of the captured element
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _VOID_TAGS:
+            return
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        role = None
+        cur = self._current
+        if cur is None:
+            if "result" in classes:
+                role = "result"
+                self._current = {"href": None, "title": None, "snippet": None}
+        elif self._text is None:
+            if tag == "a" and cur["title"] is None and (self._in_title or "result__a" in classes):
+                role = "title"
+                cur["href"] = attrs.get("href") or ""
+            elif "result__snippet" in classes and cur["snippet"] is None:
+                role = "snippet"
+            elif "result__title" in classes:
+                role = "title_box"
+                self._in_title = True
+        if role in ("title", "snippet"):
+            self._text = []
+        self._stack.append((tag, role))
+
+    def handle_endtag(self, tag):
+        if not any(t == tag for t, _ in self._stack):
+            return  # stray end tag
+        while self._stack:
+            t, role = self._stack.pop()
+            self._end(role)
+            if t == tag:
+                break
+
+    def handle_data(self, data):
+        if self._text is not None:
+            data = data.strip()
+            if data:
+                self._text.append(data)
+
+    def _end(self, role):
+        if role in ("title", "snippet"):
+            self._current[role] = "".join(self._text)
+            self._text = None
+        elif role == "title_box":
+            self._in_title = False
+        elif role == "result":
+            if self._current["title"] is not None:
+                self.results.append(self._current)
+            self._current = None
+            self._in_title = False
+
+    def close(self):
+        super().close()
+        while self._stack:
+            self._end(self._stack.pop()[1])
+
+
+def _parse_ddg_page(html: str, seen_urls: set | None = None) -> list[dict]:
+    """Parse a single DuckDuckGo HTML results page.
+
+    When ``seen_urls`` is given, URLs whose canonical form is already in it are
+    skipped and new canonical forms are added to it. Callers parsing pages from
+    several threads should leave it out and dedup on the consuming side instead.
+    """
+    parser = _DDGResultParser()
+    parser.feed(html)
+    parser.close()
     results = []
-    for r in soup.select(".result"):
-        title_tag = r.select_one(".result__title a, .result__a")
-        snippet_tag = r.select_one(".result__snippet")
-        if not title_tag:
-            continue
-        raw_href = title_tag.get("href", "")
+    for r in parser.results:
+        raw_href = r["href"]
         if "uddg=" in raw_href:
             actual_url = parse_qs(urlparse(raw_href).query).get("uddg", [""])[0]
         elif raw_href.startswith("http"):
@@ -158,76 +942,306 @@ def _parse_ddg_page(html: str, seen_urls: set) -> list[dict]:
         else:
             continue
         actual_url = unquote(actual_url)
-        if actual_url and actual_url not in seen_urls:
-            seen_urls.add(actual_url)
-            results.append({
-                "title": clean_text(title_tag.get_text(strip=True)),
-                "url": actual_url,
-                "snippet": clean_text(snippet_tag.get_text(strip=True)) if snippet_tag else "",
-            })
+        if not actual_url:
+            continue
+        if seen_urls is not None:
+            key = canonical_url(actual_url)
+            if key in seen_urls:
+                continue
+            seen_urls.add(key)
+        results.append({
+            "title": clean_text(r["title"]),
+            "url": actual_url,
+            "snippet": clean_text(r["snippet"] or ""),
+        })
     return results
 
 
-def web_search(query: str, num_results: int = 10) -> list[dict]:
-    """Return list of {title, url, snippet} using DuckDuckGo HTML search with pagination."""
-    results = []
-    seen_urls: set[str] = set()
-    max_pages = min((num_results + 19) // 20, 5)  # ~20 results per page, max 5 pages
+class DuckDuckGoProvider(SearchProvider):
+    """Scrapes the html.duckduckgo.com results page (~20 results per page)."""
+
+    name = "ddg"
+
+    def __init__(self, base_url: str = "https://html.duckduckgo.com/html/"):
+        self.base_url = base_url
+
+    @property
+    def cache_namespace(self) -> str:
+        return f"{self.name}:{self.base_url}"
 
-    def _fetch_page(page_num: int) -> list[dict]:
+    def page_url(self, query: str, page_num: int) -> str:
         if page_num == 0:
-            url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}"
-        else:
-            offset = page_num * 20
-            url = f"https://html.duckduckgo.com/html/?q={quote_plus(query)}&s={offset}&dc={offset + 1}"
-        try:
-            resp = SESSION.get(url, timeout=TIMEOUT)
-            resp.raise_for_status()
-            return _parse_ddg_page(resp.text, seen_urls)
-        except Exception:
+            return f"{self.base_url}?q={quote_plus(query)}"
+        offset = page_num * self.page_size
+        return f"{self.base_url}?q={quote_plus(query)}&s={offset}&dc={offset + 1}"
+
+    def fetch_page(self, query: str, page_num: int) -> list[dict]:
+        resp = _session().get(self.page_url(query, page_num), timeout=_budget().timeout())
+        resp.raise_for_status()
+        return _parse_ddg_page(decode_html(resp.content, resp.headers.get("Content-Type"))[0])
+
+
+class FixtureProvider(SearchProvider):
+    """Replays recorded SERPs from a local directory — no network access.
+
+    For page N of a query it looks for ``<slug>_p<N>.html`` (a saved DuckDuckGo
+    HTML page, run through the normal parser) or ``<slug>_p<N>.json`` (a list of
+    already-parsed results). Missing pages are empty, unless ``record_from`` is
+    given: then the page is fetched from that provider and saved as JSON, so a
+    live run can be recorded once and replayed after.
+    """
+
+    name = "fixture"
+    cacheable = False
+
+    def __init__(self, fixture_dir: str = "fixtures", record_from: SearchProvider | None = None):
+        self.fixture_dir = fixture_dir
+        self.record_from = record_from
+        if record_from is not None:
+            self.page_size = record_from.page_size
+            self.max_pages = record_from.max_pages
+
+    @staticmethod
+    def fixture_name(query: str, page_num: int) -> str:
+        slug = re.sub(r"[^\w\s-]", "", query)[:40].strip().replace(" ", "_")
+        digest = hashlib.sha256(query.encode()).hexdigest()[:8]
+        return f"{slug}-{digest}_p{page_num}"
+
+    def fetch_page(self, query: str, page_num: int) -> list[dict]:
+        base = os.path.join(self.fixture_dir, self.fixture_name(query, page_num))
+        if os.path.exists(base + ".html"):
+            with open(base + ".html", "r", encoding="utf-8") as f:
+                return _parse_ddg_page(f.read())
+        if os.path.exists(base + ".json"):
+            with open(base + ".json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        if self.record_from is None:
             return []
+        results = self.record_from.fetch_page(query, page_num)
+        os.makedirs(self.fixture_dir, exist_ok=True)
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        return results
 
-    # Fetch first page synchronously to get initial results
-    first_page = _fetch_page(0)
-    results.extend(first_page)
-
-    # Fetch remaining pages concurrently if needed
-    if len(results) < num_results and max_pages > 1:
-        with ThreadPoolExecutor(max_workers=4) as pool:
-            futures = [pool.submit(_fetch_page, i) for i in range(1, max_pages)]
-            for future in as_completed(futures):
-                page_results = future.result()
-                results.extend(page_results)
-                if len(results) >= num_results:
-                    break
 
-    return results[:num_results]
+SEARCH_PROVIDERS: dict[str, type[SearchProvider]] = {
+    "ddg": DuckDuckGoProvider,
+    "fixture": FixtureProvider,
+}
+
+
+def get_search_provider(name: str = "ddg", **kwargs) -> SearchProvider:
+    """Instantiate a registered search provider by name."""
+    cls = SEARCH_PROVIDERS.get(name)
+    if not cls:
+        raise ValueError(f"Unknown search provider: {name}. Use: {', '.join(SEARCH_PROVIDERS)}")
+    return cls(**kwargs)
+
+
+# ── Paginated Search ─────────────────────────────────────────────────────────
+
+def _fetch_search_page(provider: SearchProvider, query: str, page_num: int,
+                       use_cache: bool, cache_ttl: int) -> list[dict]:
+    pages_total = _metrics().counter("plethora_search_pages_total",
+                                     "Search result pages by provider and outcome")
+    cacheable = use_cache and provider.cacheable
+    if cacheable:
+        cached = _search_cache_get(provider.cache_namespace, query, page_num, cache_ttl)
+        if cached is not None:
+            pages_total.inc(provider=provider.name, result="cache_hit")
+            return cached
+    try:
+        with _profiler().span("search_page"):
+            results = provider.fetch_page(query, page_num)
+    except Exception:
+        pages_total.inc(provider=provider.name, result="error")
+        return []
+    pages_total.inc(provider=provider.name, result="fetched")
+    if cacheable and results:
+        _search_cache_put(provider.cache_namespace, query, page_num, results)
+    return results
+
+
+def iter_search(query: str, num_results: int = 10, provider: SearchProvider | None = None,
+                use_cache: bool = True, cache_ttl: int = SEARCH_CACHE_TTL,
+                on_first_page=None) -> Iterator[dict]:
+    """Yield {title, url, snippet} in rank order as result pages are parsed.
+
+    Result pages are requested up to SEARCH_LOOKAHEAD pages ahead of the one
+    being consumed. Page N is released only after pages 0..N-1, so results come
+    out in rank order, and each page is yielded as soon as it (and its
+    predecessors) are ready — consumers can start work on the first results
+    while later pages are still in flight. Dedup happens here, in the consuming
+    thread. Once ``num_results`` have been yielded (or the caller stops
+    iterating) no further pages are requested; the ones already in flight are
+    abandoned rather than waited on.
+
+    ``provider`` defaults to DuckDuckGo. Pages are cached per
+    (provider, query, page) for ``cache_ttl`` seconds unless ``use_cache`` is off.
+    ``on_first_page(results)`` is called, from the search thread, with the first
+    results page's results as soon as it is parsed.
+    """
+    provider = provider or DuckDuckGoProvider()
+    max_pages = min((num_results + provider.page_size - 1) // provider.page_size,
+                    provider.max_pages)
+    max_pages = max(max_pages, 1)
+    seen_urls: set[str] = set()
+    count = 0
+
+    from concurrent.futures import TimeoutError as FuturesTimeout
+
+    pool = _RunPool(min(max_pages, SEARCH_LOOKAHEAD + 1))
+    futures = [pool.submit(_fetch_search_page, provider, query, i, use_cache, cache_ttl)
+               for i in range(min(max_pages, SEARCH_LOOKAHEAD + 1))]
+    if on_first_page is not None:
+        def _first_page_done(future):
+            if not future.cancelled() and future.exception() is None:
+                on_first_page(future.result())
+        futures[0].add_done_callback(_first_page_done)
+    try:
+        for page_num in range(max_pages):
+            ahead = page_num + SEARCH_LOOKAHEAD
+            if ahead < max_pages and ahead == len(futures):
+                futures.append(pool.submit(_fetch_search_page, provider, query, ahead,
+                                           use_cache, cache_ttl))
+            try:
+                results = futures[page_num].result(timeout=_budget().wait_time())
+            except FuturesTimeout:  # run deadline reached
+                return
+            for r in results:
+                key = canonical_url(r["url"])
+                if key in seen_urls:
+                    continue
+                seen_urls.add(key)
+                yield r
+                count += 1
+                if count >= num_results:
+                    return
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def web_search(query: str, num_results: int = 10, provider: SearchProvider | None = None,
+               use_cache: bool = True, cache_ttl: int = SEARCH_CACHE_TTL) -> list[dict]:
+    """Return list of {title, url, snippet} from the search provider (DuckDuckGo by default)."""
+    return list(iter_search(query, num_results, provider, use_cache, cache_ttl))
 
 
 # ── Page Scraper ─────────────────────────────────────────────────────────────
 
+class _Flight:
+    """One in-progress scrape that concurrent callers for the same URL wait on."""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight: dict[str, _Flight] = {}  # canonical URL → scrape in progress
+_inflight_lock = threading.Lock()
+
+
 def scrape_page(url: str, use_cache: bool = True, cache_ttl: int = 3600) -> dict:
-    """Scrape a single page and return structured content."""
+    """Scrape a single page and return structured content.
+
+    Concurrent calls for the same page (by canonical URL) share one fetch:
+    the first caller does the work and the others wait for its result.
+    """
+    key = canonical_url(url)
+    while True:
+        with _inflight_lock:
+            flight = _inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = _inflight[key] = _Flight()
+        if leader:
+            break
+        with _profiler().span("inflight_wait", url):
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        if flight.result.get("deadline") and not _budget().expired():
+            continue  # cut by another run's deadline, not this one's — fetch it
+        _metrics().counter("plethora_inflight_shared_total",
+                           "scrape_page calls served by a concurrent scrape of the same URL").inc()
+        page = dict(flight.result)
+        page["url"] = url
+        return page
+
+    try:
+        with _profiler().span("page", url):
+            flight.result = _scrape_page(url, use_cache, cache_ttl)
+    except BaseException as e:
+        flight.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        flight.done.set()
+    return flight.result
+
+
+def _scrape_page(url: str, use_cache: bool, cache_ttl: int) -> dict:
+    prof = _profiler()
+    m = _metrics()
+    budget = _budget()
+
     # Cache check
     if use_cache:
-        cached = _cache_get(url, cache_ttl)
+        with prof.span("cache_get"):
+            cached = _cache_get(url, cache_ttl)
+        m.counter("plethora_cache_requests_total", "URL cache lookups by result").inc(
+            result="hit" if cached else "miss")
         if cached:
+            cached["url"] = url  # may have been stored under a redirect target or variant
             cached["_cached"] = True
             return cached
 
+    if budget.expired():
+        return {"url": url, "error": DEADLINE_SKIPPED, "deadline": "skipped"}
+
     # robots.txt check
-    if not _is_allowed(url):
+    with prof.span("robots"):
+        allowed = _is_allowed(url)
+    if not allowed:
+        m.counter("plethora_robots_blocked_total", "URLs skipped because of robots.txt").inc(
+            domain=urlparse(url).netloc)
         return {"url": url, "error": "Blocked by robots.txt", "_robots_blocked": True}
 
-    _rate_limit(url)
+    with prof.span("rate_limit_wait"):
+        _rate_limit(url)
+    if budget.expired():
+        return {"url": url, "error": DEADLINE_SKIPPED, "deadline": "skipped"}
 
+    # Stream so time-to-headers (incl. connect) and body download are timed separately
+    resp = None
+    fetch_start = time.perf_counter()
     try:
-        resp = SESSION.get(url, timeout=TIMEOUT)
-        resp.raise_for_status()
+        with prof.span("ttfb"):
+            resp = _session().get(url, timeout=budget.timeout(), stream=True)
+            resp.raise_for_status()
+        with prof.span("download"):
+            body = resp.content
     except Exception as e:
+        if resp is not None:
+            resp.close()
+        _record_fetch(url, fetch_start, resp, e)
         return {"url": url, "error": str(e)}
+    _record_fetch(url, fetch_start, resp, None)
+    final_url = resp.url or url  # after redirects; relative links resolve against it
+    if budget.expired():  # run() has stopped waiting; don't spend CPU parsing
+        return {"url": url, "error": DEADLINE_UNFINISHED, "deadline": "unfinished"}
+
+    # Decoded once, from the declared (or prefix-sniffed) encoding — see charset.py
+    with prof.span("decode"):
+        html, _encoding = decode_html(body, resp.headers.get("Content-Type"))
 
-    soup = BeautifulSoup(resp.text, "html.parser")
+    from bs4 import BeautifulSoup
+
+    parse_start = time.perf_counter()
+    soup = BeautifulSoup(html, "html.parser")
 
     # Remove noise elements
     noise_selectors = [
@@ -243,6 +1257,8 @@ def scrape_page(url: str, use_cache: bool = True, cache_ttl: int = 3600) -> dict
     # Also remove Wikipedia infobox tables
     for tag in soup.select(".infobox, .navbox, .metadata, .ambox, .mbox-small"):
         tag.decompose()
+    extract_start = time.perf_counter()
+    prof.add("parse", parse_start, extract_start)
 
     title = soup.title.get_text(strip=True) if soup.title else ""
     meta_desc = ""
@@ -300,7 +1316,7 @@ def scrape_page(url: str, use_cache: bool = True, cache_ttl: int = 3600) -> dict
     # Images (metadata only)
     images = []
     for img in content_root.find_all("img", src=True):
-        src = urljoin(url, img["src"])
+        src = urljoin(final_url, img["src"])
         alt = img.get("alt", "").strip()
         if src.startswith("http") and alt and len(alt) > 3:
             images.append({"src": src, "alt": clean_text(alt[:200])})
@@ -309,11 +1325,12 @@ def scrape_page(url: str, use_cache: bool = True, cache_ttl: int = 3600) -> dict
     links = []
     link_urls_seen = set()
     for a in content_root.find_all("a", href=True):
-        href = urljoin(url, a["href"])
+        href = urljoin(final_url, a["href"])
         link_text = a.get_text(strip=True)[:100]
-        if (href.startswith("http") and href not in link_urls_seen
+        link_key = canonical_url(href)
+        if (href.startswith("http") and link_key not in link_urls_seen
                 and link_text and not href.startswith("javascript:")):
-            link_urls_seen.add(href)
+            link_urls_seen.add(link_key)
             links.append({"text": clean_text(link_text), "url": href})
 
     result = {
@@ -327,138 +1344,541 @@ def scrape_page(url: str, use_cache: bool = True, cache_ttl: int = 3600) -> dict
         "images": images[:20],
         "links": links[:50],
     }
+    if canonical_url(final_url) != canonical_url(url):
+        result["final_url"] = final_url
+    prof.add("extract", extract_start, time.perf_counter())
+
+    # Near-duplicate fingerprint — stored with the page so cache hits reuse it
+    with prof.span("fingerprint"):
+        page_fingerprint(result)
 
     # Store in cache
     if use_cache:
-        _cache_put(url, result)
+        with prof.span("cache_put"):
+            _cache_put(final_url, result, aliases=[url] + [r.url for r in resp.history])
+        with prof.span("index"):
+            _index_page(final_url, result)
 
     return result
 
 
-def scrape_subpages(page_data: dict, max_subpages: int = 3,
-                    use_cache: bool = True, cache_ttl: int = 3600) -> list[dict]:
-    """Follow links from a page and scrape sub-pages (same domain only)."""
-    if "error" in page_data:
-        return []
-    base_domain = urlparse(page_data["url"]).netloc
-    seen = {page_data["url"]}
-    subpages = []
+# Junk links never followed as sub-pages (anchors, login, mailto, media files)
+_SUBPAGE_SKIP_RE = re.compile(
+    r"(#|mailto:|javascript:|\.pdf$|\.png$|\.jpg$|\.gif$|\.svg$|"
+    r"/login|/signup|/register|/auth|/search\?|/tag/|/category/)",
+    re.IGNORECASE,
+)
 
-    # Filter out junk links (anchors, login, mailto, media files)
-    skip_patterns = re.compile(
-        r"(#|mailto:|javascript:|\.pdf$|\.png$|\.jpg$|\.gif$|\.svg$|"
-        r"/login|/signup|/register|/auth|/search\?|/tag/|/category/)",
-        re.IGNORECASE,
-    )
+
+def subpage_candidates(page_data: dict, max_subpages: int = 3,
+                       exclude: set[str] | frozenset[str] = frozenset()) -> list[str]:
+    """Links scrape_subpages() would follow: same domain, not junk, and whose
+    canonical URL is not in ``exclude`` (pages some other parent already has)."""
+    if "error" in page_data or page_data.get("duplicate_of"):
+        return []
+    base_url = page_data.get("final_url", page_data["url"])
+    base_domain = urlparse(base_url).netloc
+    seen = {canonical_url(page_data["url"]), canonical_url(base_url)}
 
     candidates = []
     for link in page_data.get("links", []):
         link_url = link["url"]
+        link_key = canonical_url(link_url)
         if (urlparse(link_url).netloc == base_domain
-                and link_url not in seen
-                and not skip_patterns.search(link_url)):
-            seen.add(link_url)
+                and link_key not in seen and link_key not in exclude
+                and not _SUBPAGE_SKIP_RE.search(link_url)):
+            seen.add(link_key)
             candidates.append(link_url)
         if len(candidates) >= max_subpages:
             break
+    return candidates
+
+
+def scrape_subpages(page_data: dict, max_subpages: int = 3,
+                    use_cache: bool = True, cache_ttl: int = 3600,
+                    exclude: set[str] | frozenset[str] = frozenset()) -> list[dict]:
+    """Follow links from a page and scrape sub-pages (same domain only).
 
-    for link_url in candidates:
+    Near-duplicates of an earlier page (``duplicate_of`` set) are not expanded,
+    and links whose canonical URL is in ``exclude`` are passed over.
+    """
+    subpages = []
+    for link_url in subpage_candidates(page_data, max_subpages, exclude):
         sub = scrape_page(link_url, use_cache=use_cache, cache_ttl=cache_ttl)
         if "error" not in sub:
             subpages.append(sub)
     return subpages
 
 
+# ── Progress Reporting ───────────────────────────────────────────────────────
+
+class _StageProgress:
+    """Rich progress bar for one pipeline stage, or plain log lines without Rich."""
+
+    def __init__(self, progress, task, log):
+        self._progress = progress
+        self._task = task
+        self._log = log
+
+    def set_total(self, total: int) -> None:
+        if self._progress is not None:
+            self._progress.update(self._task, total=total)
+
+    def advance(self, message: str) -> None:
+        if self._progress is not None:
+            self._progress.advance(self._task)
+        else:
+            self._log(message)
+
+
+@contextmanager
+def _stage_progress(use_rich: bool, log, description: str, total: int | None):
+    if not use_rich:
+        yield _StageProgress(None, None, log)
+        return
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+    with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"),
+                  BarColumn(), TextColumn("{task.completed}/{task.total}")) as progress:
+        task = progress.add_task(description, total=total)
+        yield _StageProgress(progress, task, log)
+
+
+# ── Near-duplicate Collapsing ────────────────────────────────────────────────
+
+def _mark_duplicates(pages: list[dict], index: FingerprintIndex) -> int:
+    """Set ``duplicate_of`` on pages that are near-duplicates of one already in
+    ``index``; index the rest. Returns the number marked."""
+    marked = 0
+    for page in pages:
+        page.pop("duplicate_of", None)
+        fp = page_fingerprint(page)
+        if fp is None:
+            continue
+        original = index.add(fp, page["url"])
+        if original is not None and original != page["url"]:
+            page["duplicate_of"] = original
+            marked += 1
+    return marked
+
+
+# ── Run Deadline ─────────────────────────────────────────────────────────────
+# run(deadline=...) bounds the whole run. A share of the budget is kept back
+# for writing reports; until the rest is spent, fetch timeouts are clipped to
+# the time left. After that, fetches that would start are skipped, stages
+# stop waiting (queued work is cancelled, running fetches abandoned) and the
+# report is written from what finished, with the rest marked. An abandoned
+# fetch still holds its own run's budget, so it stops at its next check
+# without parsing or caching; its daemon thread never holds up exit.
+
+DEADLINE_RENDER_SHARE = 0.1   # of the budget kept back for writing reports
+DEADLINE_SUBPAGE_SHARE = 0.3  # sub-pages are expanded only if this much is left
+DEADLINE_SKIPPED = "Skipped: run deadline reached before it was fetched"
+DEADLINE_UNFINISHED = "Unfinished: still loading at the run deadline"
+
+
+class _Budget:
+    """Work time left in a run; unbounded when ``seconds`` is None."""
+
+    def __init__(self, seconds: float | None = None):
+        self.seconds = seconds
+        self._end = (None if seconds is None
+                     else time.monotonic() + seconds * (1 - DEADLINE_RENDER_SHARE))
+
+    @property
+    def bounded(self) -> bool:
+        return self._end is not None
+
+    def left(self) -> float:
+        return float("inf") if self._end is None else self._end - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.left() <= 0
+
+    def timeout(self) -> float:
+        """Request timeout: TIMEOUT, or less if the budget ends sooner."""
+        return min(TIMEOUT, max(self.left(), 0.05))
+
+    def wait_time(self) -> float | None:
+        return None if self._end is None else max(self.left(), 0.0)
+
+
+NO_BUDGET = _Budget()
+
+
+def _preload_renderers(formats: list[str]) -> None:
+    """Import fpdf in the background while a deadline-bounded run is waiting
+    on the network, so rendering at the end isn't charged for the import."""
+    if "pdf" not in formats:
+        return
+
+    def _load():
+        try:
+            import fpdf  # noqa: F401
+        except ImportError:
+            pass
+
+    threading.Thread(target=_load, name="preload-fpdf", daemon=True).start()
+
+
+@contextmanager
+def _worker_pool(workers: int):
+    """_RunPool for one stage. In a deadline-bounded run it is shut down
+    without waiting — anything still running was given up on, and stops at
+    its next budget check."""
+    bounded = _budget().bounded
+    pool = _RunPool(workers)
+    try:
+        yield pool
+    finally:
+        pool.shutdown(wait=not bounded, cancel_futures=bounded)
+
+
+def _collect(futures, on_done) -> list:
+    """Pass futures to ``on_done`` as they finish, until all have or the
+    budget runs out. Returns the rest in submission order; those that never
+    started are cancelled."""
+    from concurrent.futures import TimeoutError as FuturesTimeout, as_completed
+
+    pending = set(futures)
+    try:
+        for future in as_completed(futures, timeout=_budget().wait_time()):
+            pending.discard(future)
+            on_done(future)
+    except FuturesTimeout:
+        for future in [f for f in futures if f in pending and f.done()]:
+            pending.discard(future)
+            on_done(future)
+    late = [f for f in futures if f in pending]
+    for future in late:
+        future.cancel()
+    return late
+
+
 # ── Main Pipeline ────────────────────────────────────────────────────────────
 
+JOURNAL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".runs")
+
+
+# Cache hits are journaled by reference and re-read from the cache on resume:
+# writing one out in full would decode every lazily unpacked section.
+def _journal_form(page) -> dict:
+    if page.get("_cached"):
+        return {"url": page["url"], "_cached": True}
+    return page
+
+
+def _from_journal(pages: list[dict]) -> list | None:
+    """Journaled pages with cache references resolved; None if a referenced
+    entry is gone from the cache (that work is then redone)."""
+    out = []
+    for page in pages:
+        if page.keys() == {"url", "_cached"}:
+            cached = _cache_get(page["url"], None)
+            if cached is None:
+                return None
+            cached["url"] = page["url"]
+            cached["_cached"] = True
+            page = cached
+        out.append(page)
+    return out
+
+
 def run(query: str, level: str = "medium", num_results: int = 5,
         max_subpages: int = 2, output_dir: str = "reports",
         workers: int = 4, use_cache: bool = True, cache_ttl: int = 3600,
-        quiet: bool = False, out_format: str = "txt") -> list[str]:
+        quiet: bool = False, out_format: str = "txt",
+        search_provider: SearchProvider | None = None,
+        search_cache_ttl: int = SEARCH_CACHE_TTL,
+        profiler: Profiler | None = None,
+        metrics: MetricsRegistry | None = None,
+        run_id: str | None = None, resume: str | None = None,
+        journal: bool = True, local_first: bool = False,
+        coordinator=None, deadline: float | None = None) -> list[str]:
     """
     Run the full scrape pipeline.
       level: low | medium | high
       out_format: txt | md | html | json | pdf | all
+      search_provider: SearchProvider instance (default: DuckDuckGo)
+      profiler: collects per-URL stage timings and per-format render time
+      metrics: registry for fetch/cache/robots/error counters and latency histograms
+      run_id: id for this run's journal in .runs/ (generated if not given)
+      resume: id of an interrupted run — its journaled query/level/result
+              count/format are reused and only unfinished work is redone
+      journal: keep an append-only journal so the run can be resumed
+      local_first: take results from the local full-text index first (pages
+                   are read from the URL cache, whatever their age) and
+                   search the web only for the remainder
+      coordinator: distributed.Coordinator — pages and sub-pages are scraped
+                   by shard workers (see distributed.py) instead of locally
+      deadline: seconds the whole run may take. Sub-page expansion is dropped
+                first when time runs low; at the deadline unfinished fetches
+                are abandoned and the report marks what was skipped. A cut-short
+                run keeps its journal, so --resume can finish it
+      Profiler, metrics and deadline apply to this call only; concurrent
+      run() calls in one process don't share them.
       Returns: list of paths to saved report files
     """
+    if resume:
+        jr = RunJournal.resume(resume, JOURNAL_DIR)
+        params = jr.state.params
+        query, level = params["query"], params["level"]
+        num_results, max_subpages = params["num_results"], params["max_subpages"]
+        out_format = params["out_format"]
+    elif journal:
+        from journal import new_run_id
+        jr = RunJournal.create(run_id or new_run_id(), JOURNAL_DIR, {
+            "query": query, "level": level, "num_results": num_results,
+            "max_subpages": max_subpages, "out_format": out_format,
+        })
+    else:
+        jr = NULL_JOURNAL
+
+    metrics = metrics or NULL_METRICS
+    scope = _run_scope.set((profiler or NULL_PROFILER, metrics,
+                            _Budget(deadline) if deadline is not None else NO_BUDGET))
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        paths, complete = _run(query, level, num_results, max_subpages, output_dir, workers,
+                               use_cache, cache_ttl, quiet, out_format, search_provider,
+                               search_cache_ttl, local_first, coordinator, jr)
+        if complete:
+            outcome = "ok"
+            jr.discard()
+        else:
+            outcome = "deadline"  # journal kept (closed below) for --resume
+        return paths
+    except KeyboardInterrupt:
+        outcome = "interrupted"
+        raise
+    finally:
+        # Queued cache writes land before run() returns — or re-raises an
+        # interrupt — so a resumed or repeated run finds them on disk.
+        _cache_writer.flush()
+        metrics.counter("plethora_runs_total", "Pipeline runs by level and outcome").inc(
+            level=level, outcome=outcome)
+        metrics.histogram("plethora_run_duration_seconds", "Wall time of run()",
+                          buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1800)).observe(
+            time.perf_counter() - start, level=level)
+        metrics.gauge("plethora_last_run_timestamp_seconds", "Unix time the last run finished").set(
+            time.time(), level=level)
+        if outcome != "ok":
+            jr.close()
+        _run_scope.reset(scope)
+
+
+def _run(query, level, num_results, max_subpages, output_dir, workers, use_cache,
+         cache_ttl, quiet, out_format, search_provider, search_cache_ttl,
+         local_first, coordinator, jr) -> tuple[list[str], bool]:
     from formatter import format_report
 
+    prof = _profiler()
+    budget = _budget()
+    done = jr.state  # work already journaled by an earlier, interrupted attempt
+
     level = level.lower().strip()
     assert level in ("low", "medium", "high"), "Level must be low, medium, or high"
 
     log = (lambda *a, **kw: None) if quiet else print
     errors: list[dict] = []
 
-    try:
-        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
-        use_rich = not quiet
-    except ImportError:
-        use_rich = False
-
-    # ── Search ───────────────────────────────────────────────────────────
-    log(f"[*] Searching for: {query}")
-    search_results = web_search(query, num_results)
-    log(f"[+] Found {len(search_results)} results")
+    # Only look rich up here; _stage_progress imports it when a bar is shown,
+    # which a --level low run never does.
+    use_rich = not quiet and importlib.util.find_spec("rich") is not None
 
+    search_results: list[dict] = []
     pages: list[dict] = []
     all_subpages: dict[str, list[dict]] = {}
+    # What the deadline cut: URLs never fetched / still loading, sub-pages
+    cut = {"skipped": [], "unfinished": [], "search": "complete", "subpages": "complete"}
+
+    if done.pages or done.search_done:
+        log(f"[*] Resuming run {jr.run_id}: {len(done.pages)} page(s) already done")
+
+    # Search results come from the journal when an earlier attempt finished
+    # the search stage; otherwise they are (re)fetched and journaled. With
+    # local_first, local index hits come first and the web fills the rest.
+    def _search_source(on_first_page=None):
+        if done.search_done:
+            yield from done.search_results
+            return
+        local = search_local(query, num_results, mark=("", "")) if local_first else []
+        _metrics().counter("plethora_local_index_hits_total",
+                           "Search results served from the local index").inc(len(local))
+        seen = set()
+        for hit in local:
+            sr = {"title": hit["title"], "url": hit["url"], "snippet": hit["snippet"],
+                  "source": "local"}
+            seen.add(canonical_url(sr["url"]))
+            jr.search_result(sr)
+            yield sr
+        wanted = num_results - len(local)
+        if wanted > 0:
+            for sr in iter_search(query, num_results, search_provider,
+                                  use_cache=use_cache, cache_ttl=search_cache_ttl,
+                                  on_first_page=on_first_page):
+                if canonical_url(sr["url"]) in seen:
+                    continue
+                jr.search_result(sr)
+                yield sr
+                wanted -= 1
+                if not wanted:
+                    break
+        jr.search_done()
+
+    formats = ["txt", "md", "html", "json", "pdf"] if out_format == "all" else [out_format]
+    if budget.bounded:
+        _preload_renderers(formats)
 
-    if level != "low":
-        # ── Scrape pages (concurrent) ────────────────────────────────────
-        def _scrape_one(sr):
+    log(f"[*] Searching for: {query}")
+    if level == "low":
+        for sr in _search_source():
+            search_results.append(sr)
+            if budget.expired():
+                break
+        if budget.expired() and len(search_results) < num_results:
+            cut["search"] = "cut short"
+        log(f"[+] Found {len(search_results)} results")
+    else:
+        # ── Search + scrape pages (streamed, concurrent) ─────────────────
+        # Each result is handed to the scrape pool as soon as its results
+        # page is parsed, so fetching overlaps with the remaining search pages.
+        def _scrape_one(sr, submitted):
+            prof.add("queue_wait", submitted, time.perf_counter(), sr["url"])
+            if sr.get("source") == "local":
+                with prof.span("cache_get", sr["url"]):
+                    page = _cache_get(sr["url"], None)
+                if page:
+                    page["url"] = sr["url"]
+                    page["_cached"] = True
+                    return page
             return scrape_page(sr["url"], use_cache=use_cache, cache_ttl=cache_ttl)
 
-        if use_rich:
-            with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"),
-                          BarColumn(), TextColumn("{task.completed}/{task.total}")) as progress:
-                task = progress.add_task("Scraping pages", total=len(search_results))
-                with ThreadPoolExecutor(max_workers=workers) as pool:
-                    futures = {pool.submit(_scrape_one, sr): sr for sr in search_results}
-                    for future in as_completed(futures):
-                        page = future.result()
-                        pages.append(page)
-                        if page.get("error"):
-                            errors.append({"url": page["url"], "error": page["error"]})
-                        progress.advance(task)
-        else:
-            with ThreadPoolExecutor(max_workers=workers) as pool:
-                futures = {pool.submit(_scrape_one, sr): i for i, sr in enumerate(search_results)}
-                for future in as_completed(futures):
-                    page = future.result()
-                    pages.append(page)
-                    if page.get("error"):
-                        errors.append({"url": page["url"], "error": page["error"]})
-                    log(f"[*] Scraped: {page['url'][:70]}")
+        # With a coordinator, web results go to the worker owning their host;
+        # local index hits are still read from this machine's cache.
+        def _submit_page(pool, sr):
+            if coordinator is not None and sr.get("source") != "local":
+                return coordinator.submit_page(sr["url"], use_cache, cache_ttl)
+            return pool.submit(_scrape_one, sr, time.perf_counter())
+
+        # Hosts on the first results page are warmed up (DNS, robots.txt,
+        # TCP/TLS) while the remaining search pages load. Pages the journal
+        # or the cache will supply, and a coordinator's remote fetches, skip it.
+        def _prewarm_first_page(results):
+            prewarm([r["url"] for r in results[:num_results] if r["url"] not in done.pages
+                     and not (use_cache and _cache_has(r["url"], cache_ttl))])
+
+        def _page_done(future):
+            page = future.result()
+            if page.get("deadline"):
+                cut[page["deadline"]].append(page["url"])
+            else:
+                jr.page(_journal_form(page))
+            # Keep the compact form for the rest of the run; every page
+            # stays resident until the reports are written.
+            pages.append(PageRecord.from_dict(page))
+            progress.advance(f"[*] Scraped: {page['url'][:70]}")
+
+        with _stage_progress(use_rich, log, "Scraping pages", num_results) as progress, \
+                _worker_pool(workers) as pool:
+            futures = {}  # future → search result
+            warm = _prewarm_first_page if PREWARM and coordinator is None else None
+            for sr in _search_source(warm):
+                search_results.append(sr)
+                journaled = (_from_journal([done.pages[sr["url"]]])
+                             if sr["url"] in done.pages else None)
+                if journaled is not None:
+                    pages.append(PageRecord.from_dict(journaled[0]))
+                else:
+                    futures[_submit_page(pool, sr)] = sr
+                if budget.expired():
+                    break
+            if budget.expired() and len(search_results) < num_results:
+                cut["search"] = "cut short"
+            progress.set_total(len(search_results))
+            log(f"[+] Found {len(search_results)} results")
+            for _ in range(len(search_results) - len(futures)):
+                progress.advance("[*] Scraped: (from journal)")
+            late = _collect(futures, _page_done)
+            for future in late:
+                url = futures[future]["url"]
+                state = "skipped" if future.cancelled() else "unfinished"
+                cut[state].append(url)
+                pages.append(PageRecord.from_dict({
+                    "url": url, "deadline": state,
+                    "error": DEADLINE_SKIPPED if state == "skipped" else DEADLINE_UNFINISHED,
+                }))
+            if coordinator is not None:
+                coordinator.withdraw(late)  # remote fetches still running
 
         # Reorder pages to match search result order
         url_order = {sr["url"]: i for i, sr in enumerate(search_results)}
         pages.sort(key=lambda p: url_order.get(p["url"], 999))
-
-        if level == "high":
+        errors.extend({"url": p["url"], "error": p["error"]} for p in pages
+                      if p.get("error") and not p.get("deadline"))
+
+        # Collapse near-duplicates in rank order: the first copy is kept and
+        # later ones are marked so they are neither expanded nor rendered.
+        fingerprints = FingerprintIndex()
+        _mark_duplicates(pages, fingerprints)
+
+        if level == "high" and budget.left() < (budget.seconds or 0) * DEADLINE_SUBPAGE_SHARE:
+            # Too little of the budget left: the pages matter more.
+            cut["subpages"] = "dropped"
+            log("[!] Deadline: too little time left, skipping sub-page expansion")
+        elif level == "high":
             # ── Scrape sub-pages (concurrent per parent) ─────────────────
-            def _scrape_subs(page):
-                if "error" in page:
+            # A URL is scraped for at most one parent per run. Claims are made
+            # here in rank order — result pages first, then each parent's
+            # candidates — so which parent gets a shared link is deterministic;
+            # each parent skips what was claimed before it.
+            claimed = {canonical_url(u) for p in pages
+                       for u in (p["url"], p.get("final_url")) if u}
+            exclusions = {}
+            for p in pages:
+                exclusions[p["url"]] = frozenset(claimed)
+                claimed.update(canonical_url(u) for u in
+                               subpage_candidates(p, max_subpages, claimed))
+
+            def _scrape_subs(page, submitted):
+                prof.add("queue_wait", submitted, time.perf_counter(), page["url"])
+                if "error" in page or page.get("duplicate_of"):
                     return page["url"], []
                 return page["url"], scrape_subpages(
-                    page, max_subpages, use_cache=use_cache, cache_ttl=cache_ttl)
-
-            if use_rich:
-                with Progress(SpinnerColumn(), TextColumn("[progress.description]{task.description}"),
-                              BarColumn(), TextColumn("{task.completed}/{task.total}")) as progress:
-                    task = progress.add_task("Scraping sub-pages", total=len(pages))
-                    with ThreadPoolExecutor(max_workers=workers) as pool:
-                        futures = [pool.submit(_scrape_subs, p) for p in pages]
-                        for future in as_completed(futures):
-                            parent_url, subs = future.result()
-                            all_subpages[parent_url] = subs
-                            progress.advance(task)
-            else:
-                with ThreadPoolExecutor(max_workers=workers) as pool:
-                    futures = [pool.submit(_scrape_subs, p) for p in pages]
-                    for future in as_completed(futures):
-                        parent_url, subs = future.result()
-                        all_subpages[parent_url] = subs
-                        log(f"[*] Sub-pages done: {parent_url[:60]} ({len(subs)} found)")
+                    page, max_subpages, use_cache=use_cache, cache_ttl=cache_ttl,
+                    exclude=exclusions[page["url"]])
+
+            def _subs_done(future):
+                parent_url, subs = future.result()
+                if not budget.expired():  # else some may have been skipped
+                    jr.subpages(parent_url, [_journal_form(sub) for sub in subs])
+                all_subpages[parent_url] = compact_pages(subs)
+                progress.advance(f"[*] Sub-pages done: {parent_url[:60]} ({len(subs)} found)")
+
+            with _stage_progress(use_rich, log, "Scraping sub-pages", len(pages)) as progress, \
+                    _worker_pool(workers) as pool:
+                futures = []
+                for p in pages:
+                    journaled = (_from_journal(done.subpages[p["url"]])
+                                 if p["url"] in done.subpages else None)
+                    if journaled is not None:
+                        all_subpages[p["url"]] = compact_pages(journaled)
+                        progress.advance(f"[*] Sub-pages done: {p['url'][:60]} (from journal)")
+                    elif coordinator is not None and "error" not in p and not p.get("duplicate_of"):
+                        futures.append(coordinator.submit_subpages(
+                            p, max_subpages, use_cache, cache_ttl, exclude=exclusions[p["url"]]))
+                    else:
+                        futures.append(pool.submit(_scrape_subs, p, time.perf_counter()))
+                late = _collect(futures, _subs_done)
+                if coordinator is not None:
+                    coordinator.withdraw(late)
+                if late or budget.expired():
+                    cut["subpages"] = "partial"
+
+            # Sub-pages are checked after all of them are in, parents in rank
+            # order, so which copy survives doesn't depend on thread timing.
+            for p in pages:
+                _mark_duplicates(all_subpages.get(p["url"], []), fingerprints)
 
     # ── Error summary ────────────────────────────────────────────────────
     if errors:
@@ -466,6 +1886,15 @@ def run(query: str, level: str = "medium", num_results: int = 5,
         for e in errors:
             log(f"    ✗ {e['url'][:60]} — {e['error'][:80]}")
 
+    complete = (not cut["skipped"] and not cut["unfinished"]
+                and cut["search"] == "complete" and cut["subpages"] == "complete")
+    if not complete:
+        log(f"\n[!] Deadline of {budget.seconds:g}s reached: {len(cut['skipped'])} page(s) skipped, "
+            f"{len(cut['unfinished'])} unfinished, search {cut['search']}, sub-pages {cut['subpages']}")
+        _metrics().counter("plethora_deadline_cut_pages_total",
+                           "Pages left out of a report by the run deadline").inc(
+            len(cut["skipped"]) + len(cut["unfinished"]))
+
     # ── Generate & save reports ──────────────────────────────────────────
     report_data = {
         "query": query, "level": level,
@@ -473,8 +1902,9 @@ def run(query: str, level: str = "medium", num_results: int = 5,
         "pages": pages,
         "subpages": all_subpages,
     }
+    if not complete:
+        report_data["deadline"] = {"seconds": budget.seconds, **cut}
 
-    formats = ["txt", "md", "html", "json", "pdf"] if out_format == "all" else [out_format]
     os.makedirs(output_dir, exist_ok=True)
     safe_query = re.sub(r"[^\w\s-]", "", query)[:40].strip().replace(" ", "_")
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -484,7 +1914,8 @@ def run(query: str, level: str = "medium", num_results: int = 5,
         ext = fmt
         filename = f"{safe_query}_{level}_{timestamp}.{ext}"
         filepath = os.path.join(output_dir, filename)
-        content = format_report(report_data, fmt)
+        with prof.span(f"render:{fmt}"):
+            content = format_report(report_data, fmt)
         if isinstance(content, (bytes, bytearray)):
             with open(filepath, "wb") as f:
                 f.write(content)
@@ -493,5 +1924,4 @@ def run(query: str, level: str = "medium", num_results: int = 5,
                 f.write(content)
         log(f"[+] Report saved: {filepath}")
         saved_paths.append(filepath)
-
-    return saved_paths
+    return saved_paths, complete
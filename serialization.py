@@ -0,0 +1,112 @@
+"""
+Serialization for the URL cache, run journal and JSON reports.
+
+dumps()/loads() use orjson when it is installed and fall back to the stdlib
+json module, with the same output shape either way (UTF-8, no ASCII
+escaping; page records serialize as their dict form).
+
+Cache entries use a sectioned binary container so a hit can skip decoding
+what it doesn't read:
+
+  b"PLC1"  codec (1 byte)  header length (4 bytes, big-endian)  header  sections...
+
+The header holds the page's small fields plus the byte length of each heavy
+section (links, images, tables, lists); each section is encoded on its own.
+unpack_page() decodes only the header and hands back undecoded section
+buffers, which PageRecord.from_sections() decodes on first access. The codec
+is msgpack when installed (smaller and faster to decode), otherwise JSON.
+"""
+
+import json
+import struct
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # optional: binary sections
+    msgpack = None
+
+MAGIC = b"PLC1"
+SECTIONED_KEYS = ("links", "images", "tables", "lists")
+_CODEC_JSON, _CODEC_MSGPACK = 0, 1
+_HEADER = struct.Struct(">4sBI")
+
+
+def _default(o):
+    if hasattr(o, "to_dict"):  # PageRecord
+        return o.to_dict()
+    return str(o)
+
+
+def dumps(obj, indent: bool = False) -> bytes:
+    """UTF-8 JSON; 2-space indented when ``indent``."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default,
+                            option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, ensure_ascii=False, default=_default,
+                      indent=2 if indent else None,
+                      separators=None if indent else (",", ":")).encode("utf-8")
+
+
+def loads(data):
+    """Decode JSON from bytes, str or a memoryview."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = bytes(data)
+    return json.loads(data)
+
+
+# ── Sectioned cache container ────────────────────────────────────────────────
+
+def _encode(codec: int, obj) -> bytes:
+    if codec == _CODEC_MSGPACK:
+        return msgpack.packb(obj, default=_default, use_bin_type=True)
+    return dumps(obj)
+
+
+def _decoder(codec: int):
+    if codec == _CODEC_MSGPACK:
+        if msgpack is None:
+            raise ValueError("cache entry was written with msgpack, which is not installed")
+        return lambda buf: msgpack.unpackb(buf, raw=False)
+    return loads
+
+
+def pack_page(data) -> bytes:
+    """Encode a page (or any dict) into the sectioned container."""
+    codec = _CODEC_MSGPACK if msgpack is not None else _CODEC_JSON
+    fields, sections = {}, []
+    for key in data:
+        value = data[key]
+        if key in SECTIONED_KEYS:
+            sections.append((key, _encode(codec, value)))
+        else:
+            fields[key] = value
+    header = _encode(codec, {"f": fields, "s": [[k, len(b)] for k, b in sections]})
+    return b"".join([_HEADER.pack(MAGIC, codec, len(header)), header] + [b for _, b in sections])
+
+
+def is_packed(buf: bytes) -> bool:
+    return buf[:4] == MAGIC
+
+
+def unpack_page(buf: bytes):
+    """(fields, {section: undecoded buffer}, decode) for a packed entry."""
+    magic, codec, header_len = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError("not a packed cache entry")
+    decode = _decoder(codec)
+    view = memoryview(buf)
+    pos = _HEADER.size
+    header = decode(view[pos:pos + header_len])
+    pos += header_len
+    sections = {}
+    for key, length in header["s"]:
+        sections[key] = view[pos:pos + length]
+        pos += length
+    return header["f"], sections, decode